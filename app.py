@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
-from utils.matcher import analyze_resumes
-from utils.exporter import export_excel
-import time
+from utils.matcher import iter_analyze_resumes, open_resume_cache, artifact_version, ResumePool
+from utils.exporter import (
+    export_excel, export_csv, export_jsonl, export_parquet, PARQUET_ENABLED, RESULT_COLUMNS
+)
+from utils.resume_cache import ResultCache, content_hash
+from utils.archive import ResumeSources
 
 
 
@@ -16,6 +19,61 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ================================
+# RESUME CACHE (SHARED ACROSS SESSIONS)
+# ================================
+@st.cache_resource
+def get_resume_cache():
+    return open_resume_cache()
+
+# ================================
+# ANALYSIS CACHE (SHARED ACROSS SESSIONS)
+# ================================
+# - parsed resume pools, keyed by (file hashes, scoring config): JD edits
+#   only re-score the pool, nothing is re-parsed
+# - finished results + export bytes, keyed by (pool key, JD), so widget
+#   clicks and downloads never re-run the analysis or the export
+ANALYSIS_CACHE_ENTRIES = 32
+ANALYSIS_CACHE_TTL = 60 * 60  # seconds
+
+
+@st.cache_resource
+def get_analysis_cache():
+    return ResultCache(max_entries=ANALYSIS_CACHE_ENTRIES, ttl=ANALYSIS_CACHE_TTL)
+
+
+def uploaded_file_hashes(files):
+    """SHA-256 per upload, computed once per uploaded file per session"""
+    known = st.session_state.setdefault("file_hashes", {})
+    hashes = []
+
+    for f in files:
+        file_id = getattr(f, "file_id", None)
+        digest = known.get(file_id) if file_id else None
+
+        if digest is None:
+            digest = content_hash(f.getvalue())
+            if file_id:
+                known[file_id] = digest
+
+        hashes.append(digest)
+
+    return tuple(hashes)
+
+
+def uploaded_resume_sources(files):
+    """
+    ResumeSources for the upload. Counting archive members reads whole
+    TARs, so the count is kept per upload (file hashes) for the session
+    instead of being redone on every rerun.
+    """
+    counts = st.session_state.setdefault("resume_counts", {})
+    key = uploaded_file_hashes(files)
+
+    sources = ResumeSources(files, length=counts.get(key))
+    counts[key] = len(sources)
+    return sources
+
 # ================================
 # SESSION STATE
 # ================================
@@ -296,10 +354,13 @@ st.markdown(
 
 uploaded_files = st.file_uploader(
     "Upload Resume",
-    type=["pdf", "docx"],
+    type=["pdf", "docx", "zip", "tar", "gz", "tgz"],
     accept_multiple_files=True
 )
 
+# Archives are expanded lazily, one member at a time, when analyzed
+resume_files = uploaded_resume_sources(uploaded_files or [])
+
 # Show uploaded resume names manually (fix invisible filenames)
 if uploaded_files:
     st.markdown("**Uploaded Resumes:**")
@@ -307,7 +368,7 @@ if uploaded_files:
         st.markdown(f"- {file.name}")
 
 
-st.markdown(f"**Total uploaded:** {len(uploaded_files)} Resume")
+st.markdown(f"**Total uploaded:** {len(resume_files)} Resume")
 
 
 
@@ -336,19 +397,7 @@ if st.session_state.uploaded:
     job_desc = st.text_area("Job Description", height=200)
 
     if st.button("Analyze"):
-        status = st.empty()
-
-        status.info("Reading resumes...")
-        time.sleep(0.5)
-
-        status.info("Extracting skills...")
-        time.sleep(0.7)
-
-        status.info("Matching with job description...")
-        time.sleep(0.7)
-
         st.session_state.analyzed = True
-        status.success("✅ Analysis completed")
 
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
@@ -358,12 +407,53 @@ if st.session_state.uploaded:
 
 if st.session_state.analyzed:
 
-    results = analyze_resumes(uploaded_files, job_desc)
+    pool_key = ("pool", uploaded_file_hashes(uploaded_files), artifact_version())
+    analysis_key = ("analysis", pool_key, job_desc)
+    analysis = get_analysis_cache().get(analysis_key)
+    pool = get_analysis_cache().get(pool_key) if analysis is None else None
+
+    if analysis is None and pool is not None:
+        # Same resumes, new JD: re-score the parsed pool only
+        analysis = {"results": pool.rank(job_desc), "exports": {}}
+        get_analysis_cache().put(analysis_key, analysis)
+
+    if analysis is None:
+        # Real progress: one event per resume, live top candidates while it runs
+        progress = st.progress(0.0, text="Reading resumes...")
+        live_table = st.empty()
+        results, candidates = [], []
+
+        for event in iter_analyze_resumes(resume_files, job_desc, cache=get_resume_cache()):
+            if event["type"] == "final":
+                results = event["results"]
+                candidates = event["candidates"]
+                continue
+
+            progress.progress(
+                min(event["done"] / event["total"], 1.0),
+                text=f"Analyzed {event['done']} of {event['total']} resumes ({event['file']})"
+            )
+
+            if event["top_changed"]:
+                live_table.dataframe(pd.DataFrame(event["top"]), use_container_width=True)
+
+        progress.empty()
+        live_table.empty()
+
+        if candidates:
+            get_analysis_cache().put(pool_key, ResumePool(candidates))
+
+        analysis = {"results": results, "exports": {}}
+        get_analysis_cache().put(analysis_key, analysis)
+
+    results = analysis["results"]
 
     if not results:
         st.warning("No valid results found.")
         st.stop()
 
+    st.success("✅ Analysis completed")
+
     df = pd.DataFrame(results)
 
     st.markdown(
@@ -374,7 +464,7 @@ if st.session_state.analyzed:
     st.markdown(
         '<div class="upload-subtitle">'
         f'<strong>Job Role:</strong> {job_role}<br>'
-        f'<strong>Total Resumes Analyzed:</strong> {len(uploaded_files)}'
+        f'<strong>Total Resumes Analyzed:</strong> {len(resume_files)}'
         '</div>',
         unsafe_allow_html=True
     )
@@ -433,20 +523,49 @@ if st.session_state.analyzed:
     st.markdown('<div class="upload-title">Download Result</div>', unsafe_allow_html=True)
    
 
+    # label: (file extension, mime type, builder from the result rows)
+    download_formats = {
+        "Excel (.xlsx)": (
+            "xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            lambda rows: export_excel(pd.DataFrame(rows))
+        ),
+        "CSV (.csv)": (
+            "csv", "text/csv",
+            lambda rows: export_csv(iter(rows), columns=RESULT_COLUMNS)
+        ),
+        "JSON Lines (.jsonl)": (
+            "jsonl", "application/x-ndjson",
+            lambda rows: export_jsonl(iter(rows), columns=RESULT_COLUMNS)
+        ),
+    }
+    if PARQUET_ENABLED:
+        download_formats["Parquet (.parquet)"] = (
+            "parquet", "application/vnd.apache.parquet",
+            lambda rows: export_parquet(iter(rows), columns=RESULT_COLUMNS)
+        )
+
+    download_format = st.selectbox("Format", list(download_formats))
+    extension, mime, build_export = download_formats[download_format]
+
     # Build filename ONLY from job role
     role_name = job_role.strip().replace(" ", "_") or "resume_screening"
-    final_filename = f"{role_name}_results.xlsx"
+    final_filename = f"{role_name}_results.{extension}"
 
-    # Create Excel 
-    excel_buffer = export_excel(df)
+    # Build each format once per analysis (shared entries are replaced, never mutated)
+    export_bytes = analysis["exports"].get(extension)
+    if export_bytes is None:
+        export_bytes = build_export(analysis["results"]).getvalue()
+        analysis = {**analysis, "exports": {**analysis["exports"], extension: export_bytes}}
+        get_analysis_cache().put(analysis_key, analysis)
 
 
     # Download button
     st.download_button(
         label="Download Result",
-        data=excel_buffer,
+        data=export_bytes,
         file_name=final_filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=mime
     )
 
 
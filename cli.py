@@ -0,0 +1,299 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from utils.archive import is_archive_name, is_resume_name, iter_archive_resumes
+from utils.candidate_store import CandidateStore
+from utils.matcher import iter_parse_candidates, open_resume_cache, rank_parsed_candidates_multi
+from utils.pdf_parser import PDF_BACKENDS, set_pdf_backend
+from utils.tfidf_index import TfidfIndex
+
+# Headless entry point: never imports Streamlit
+#   python cli.py resumes/ dump.zip "more/*.pdf" --jd jd.txt -o results.csv --workers 0
+#   python cli.py resumes/ --jd jd.txt --store pool.db   (also keep them in the store)
+#   python cli.py --jd jd.txt --store pool.db            (rank the stored pool only)
+#   python cli.py --jd jd.txt --store pool.db --index pool_tfidf/   (+ TF-IDF similarity)
+
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet", "xlsx")
+OUTPUT_COLUMNS = [
+    "Job",
+    "Rank",
+    "Candidate",
+    "Matching Percentage",
+    "Phone",
+    "Email",
+    "Matched Skills",
+    "Missing Skills",
+    "File"
+]
+PROGRESS_EVERY = 100
+
+
+# ================================
+# INPUT HELPERS
+# ================================
+def expand_inputs(paths):
+    """Resume files, directories (recursive), glob patterns and ZIP/TAR archives"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if is_resume_name(name) or is_archive_name(name):
+                        yield os.path.join(root, name)
+
+        elif glob.has_magic(path):
+            for match in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(match) and (is_resume_name(match) or is_archive_name(match)):
+                    yield match
+
+        elif os.path.isfile(path):
+            yield path
+
+        else:
+            print(f"WARNING: {path} not found, skipped", file=sys.stderr)
+
+
+def iter_resume_files(paths):
+    """Open resumes one at a time; archive members are read one at a time"""
+    for path in expand_inputs(paths):
+        if is_archive_name(path):
+            yield from iter_archive_resumes(path)
+            continue
+
+        with open(path, "rb") as f:
+            yield f
+
+
+def load_job_descs(jd_paths):
+    """{jd_name: text} - the name is the JD file name without extension"""
+    job_descs = {}
+
+    for path in jd_paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            job_descs[name] = f.read()
+
+    return job_descs
+
+
+def open_tfidf_index(store, directory, rebuild=False):
+    """The store's memory-mapped TF-IDF index, (re)built when missing or stale"""
+    if not rebuild and os.path.exists(os.path.join(directory, "meta.json")):
+        index = TfidfIndex(directory)
+        if not store.index_is_stale(index):
+            return index
+
+    print(f"Building TF-IDF index of {len(store)} candidates in {directory}", file=sys.stderr)
+    return store.build_tfidf_index(directory)
+
+
+# ================================
+# OUTPUT
+# ================================
+def output_format(path, fmt=None):
+    """Explicit --format, else the output file extension"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {fmt!r} (use {', '.join(OUTPUT_FORMATS)})")
+    return fmt
+
+
+def iter_output_rows(rankings):
+    for job, results in rankings.items():
+        for rank, row in enumerate(results, start=1):
+            yield {"Job": job, "Rank": rank, **row}
+
+
+def write_results(rows, path, fmt):
+    """Write result rows as they come (CSV / JSONL / Parquet are chunked)"""
+    import pandas as pd
+    from utils.exporter import export_csv, export_jsonl, export_parquet, export_excel_jobs
+
+    if fmt == "xlsx":
+        # The app's styled workbook, one results + summary sheet per JD
+        jobs = {}
+        for row in rows:
+            jobs.setdefault(row["Job"], []).append(row)
+
+        frames = {job: pd.DataFrame(job_rows, columns=OUTPUT_COLUMNS) for job, job_rows in jobs.items()}
+        with open(path, "wb") as f:
+            f.write(export_excel_jobs(frames).getvalue())
+        return sum(len(df) for df in frames.values())
+
+    writers = {"csv": export_csv, "jsonl": export_jsonl, "parquet": export_parquet}
+
+    count = 0
+    def counted():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    writers[fmt](counted(), path, columns=OUTPUT_COLUMNS)
+    return count
+
+
+def print_rankings(rankings, top):
+    for name, results in rankings.items():
+        print("=" * 60)
+        print(f"JOB: {name}  ({len(results)} candidates)")
+        print("=" * 60)
+
+        for rank, row in enumerate(results[:top], start=1):
+            print(f"{rank:>3}. {row['Candidate']:<30} {row['Matching Percentage']:>6.2f}%  {row['Email']}")
+
+        print()
+
+
+def print_summary(parsed, failures, elapsed):
+    total = parsed + len(failures)
+    rate = total / elapsed if elapsed > 0 else 0.0
+
+    print("=" * 60, file=sys.stderr)
+    print(f"Files: {total}  Parsed: {parsed}  Failed: {len(failures)}", file=sys.stderr)
+    print(f"Time: {elapsed:.1f}s  Throughput: {rate:.1f} resumes/s", file=sys.stderr)
+
+    for name, error in failures:
+        print(f"  FAILED {name}: {error}", file=sys.stderr)
+
+
+def write_outputs(rankings, args, fmt):
+    """Console rankings plus the optional --output and --json files"""
+    print_rankings(rankings, args.top)
+
+    if args.output:
+        written = write_results(iter_output_rows(rankings), args.output, fmt)
+        print(f"Wrote {written} rows to {args.output}", file=sys.stderr)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(rankings, f, indent=2, ensure_ascii=False)
+
+
+# ================================
+# MAIN
+# ================================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Rank resumes (PDF/DOCX) against one or more job descriptions"
+    )
+    parser.add_argument(
+        "resumes", nargs="*",
+        help="Resume files, directories, glob patterns or ZIP/TAR archives"
+    )
+    parser.add_argument(
+        "--jd", action="append", required=True,
+        help="Job description text file (repeat for several JDs)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Parsing processes (1 = in-process, 0 = one per CPU core)"
+    )
+    parser.add_argument(
+        "--pdf-backend", choices=PDF_BACKENDS,
+        help="PDF text backend (default: RESUME_PDF_BACKEND or pdfplumber)"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Candidates shown per JD")
+    parser.add_argument(
+        "--limit", type=int,
+        help="Keep only the best N candidates per JD (also limits --output)"
+    )
+    parser.add_argument(
+        "--min-score", type=float,
+        help="Keep only candidates scoring at least this (0-100)"
+    )
+    parser.add_argument("--cache", help="Path of the on-disk resume cache (disabled if omitted)")
+    parser.add_argument(
+        "--store",
+        help="Candidate store: parsed resumes are added to it; with no resumes, "
+             "JDs are ranked against every stored candidate (skill index only)"
+    )
+    parser.add_argument(
+        "--index",
+        help="TF-IDF index directory for --store (rebuilt when missing or out of date)"
+    )
+    parser.add_argument("-o", "--output", help="Write all ranked rows to this file")
+    parser.add_argument(
+        "--format", choices=OUTPUT_FORMATS,
+        help="Output format (default: from the --output extension)"
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write all rankings to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="No progress on stderr")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.resumes and not args.store:
+        parser.error("give resumes to parse, or --store to rank a stored pool")
+    if args.index and not args.store:
+        parser.error("--index needs --store")
+
+    fmt = None
+    if args.output:
+        try:
+            fmt = output_format(args.output, args.format)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.pdf_backend:
+        set_pdf_backend(args.pdf_backend)
+
+    job_descs = load_job_descs(args.jd)
+    cache = open_resume_cache(args.cache) if args.cache else None
+    store = CandidateStore(args.store) if args.store else None
+
+    if not args.resumes:
+        index = open_tfidf_index(store, args.index) if args.index else None
+        rankings = {
+            name: store.query(text, args.limit, args.min_score, index)
+            for name, text in job_descs.items()
+        }
+        write_outputs(rankings, args, fmt)
+        return 0
+
+    start = time.perf_counter()
+    candidates, failures = [], []
+
+    parsed = iter_parse_candidates(
+        iter_resume_files(args.resumes),
+        workers=args.workers or None,
+        cache=cache
+    )
+
+    for name, candidate, error in parsed:
+        if error:
+            failures.append((name, error))
+        else:
+            candidates.append(candidate)
+
+        done = len(candidates) + len(failures)
+        if not args.quiet and done % PROGRESS_EVERY == 0:
+            rate = done / (time.perf_counter() - start)
+            print(f"... {done} resumes ({rate:.1f}/s, {len(failures)} failed)", file=sys.stderr)
+
+    if store is not None:
+        store.add_many(candidates)
+        print(f"Candidate store: {len(store)} candidates in {args.store}", file=sys.stderr)
+        if args.index:
+            open_tfidf_index(store, args.index, rebuild=True)
+
+    # Parsed once; every JD is scored from one shared N x M matrix
+    # (shared term counts, per-JD IDF), exactly as analyze_resumes_multi
+    rankings = rank_parsed_candidates_multi(candidates, job_descs, args.limit, args.min_score)
+
+    write_outputs(rankings, args, fmt)
+
+    print_summary(len(candidates), failures, time.perf_counter() - start)
+
+    return 1 if failures and not candidates else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
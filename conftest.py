@@ -0,0 +1 @@
+# Repo root on sys.path so tests can import app modules (utils.*, cli)
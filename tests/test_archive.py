@@ -0,0 +1,102 @@
+import gzip
+import io
+import tarfile
+import zipfile
+
+from docx import Document
+
+from utils.archive import ResumeSources, UnreadableResume, iter_archive_resumes
+from utils.matcher import iter_parse_resumes
+from utils.pdf_parser import NamedBytesIO
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def make_tar_gz(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_garbage_archive_is_one_error_entry():
+    source = NamedBytesIO(b"this is not an archive" * 100, "export.zip")
+    sources = ResumeSources([source])
+
+    assert len(sources) == 1
+    items = list(sources)
+    assert len(items) == 1 and isinstance(items[0], UnreadableResume)
+    assert items[0].name == "export.zip"
+
+
+def test_bad_crc_member_does_not_stop_the_archive():
+    data = bytearray(make_zip({"a.pdf": b"A" * 2000, "b.pdf": b"B" * 2000}))
+    # Flip a byte of the first member's compressed data
+    offset = data.index(b"a.pdf") + len("a.pdf") + 2
+    data[offset] ^= 0xFF
+
+    items = list(iter_archive_resumes(NamedBytesIO(bytes(data), "export.zip")))
+
+    assert [type(item) for item in items] == [UnreadableResume, NamedBytesIO]
+    assert items[1].read() == b"B" * 2000
+
+
+def test_truncated_tar_keeps_members_before_the_damage():
+    data = make_tar_gz({"a.pdf": b"A" * 50000, "b.pdf": bytes(range(256)) * 400})
+    source = NamedBytesIO(data[:len(data) * 2 // 3], "export.tar.gz")
+
+    items = list(iter_archive_resumes(source))
+
+    assert isinstance(items[-1], UnreadableResume)
+    assert items[-1].name == "export.tar.gz"
+    # Counting never undershoots (it drives progress bars)
+    assert len(ResumeSources([source])) >= len(items)
+
+
+def test_unreadable_entry_becomes_an_error_result():
+    sources = [NamedBytesIO(b"garbage" * 100, "export.zip")]
+
+    parsed = list(iter_parse_resumes(ResumeSources(sources)))
+
+    assert len(parsed) == 1
+    name, candidate, error = parsed[0]
+    assert name == "export.zip" and candidate is None
+    assert "unreadable archive entry" in error
+
+
+def test_upper_case_extensions_are_parsed():
+    document = Document()
+    document.add_paragraph("Maria Garcia")
+    document.add_paragraph("Senior Python developer: Django, SQL and Docker on AWS")
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    sources = [NamedBytesIO(make_zip({"CV_MARIA.DOCX": buffer.getvalue()}), "EXPORT.ZIP")]
+    parsed = list(iter_parse_resumes(ResumeSources(sources)))
+
+    assert len(parsed) == 1
+    name, candidate, error = parsed[0]
+    assert error is None and name == "CV_MARIA.DOCX"
+    assert candidate["name"] == "Maria Garcia" and "django" in candidate["skills"]
+
+
+def test_unsupported_files_are_errors_not_candidates():
+    sources = [
+        NamedBytesIO(gzip.compress(b"%PDF-1.4 " * 100), "cv.pdf.gz"),
+        NamedBytesIO(b"Maria Garcia, Python developer " * 10, "cv.txt"),
+    ]
+
+    parsed = list(iter_parse_resumes(ResumeSources(sources)))
+
+    assert [candidate for _, candidate, _ in parsed] == [None, None]
+    assert "unreadable archive entry" in parsed[0][2]
+    assert "Unsupported file type" in parsed[1][2]
@@ -0,0 +1,65 @@
+from utils.candidate_store import CandidateStore
+from utils.matcher import find_ontology_skills
+
+
+def candidate(name, raw_text):
+    return {
+        "raw_text": raw_text, "clean_text": raw_text.lower(), "name": name,
+        "email": f"{name.lower()}@example.com", "phone": "",
+        "skills": sorted(find_ontology_skills(raw_text)),
+    }
+
+
+def make_store(tmp_path):
+    store = CandidateStore(str(tmp_path / "candidates.db"))
+    store.add_many(
+        [
+            candidate("Ana", "Python developer, Django and SQL"),
+            candidate("Ben", "Java developer with Spring"),
+            candidate("Cleo", "python developer building web apps"),
+            candidate("Dev", "gardening and developer relations"),
+        ],
+        keys=["ana", "ben", "cleo", "dev"]
+    )
+    return store
+
+
+def names(rows):
+    return [row["Candidate"] for row in rows]
+
+
+def test_query_ranks_from_postings(tmp_path):
+    store = make_store(tmp_path)
+
+    rows = store.query("Python developer with Django")
+
+    assert names(rows)[0] == "Ana"
+    assert "Ben" not in names(rows)
+    assert store.query("Python developer with Django", limit=1) == rows[:1]
+
+
+def test_index_survives_removed_candidates(tmp_path):
+    store = make_store(tmp_path)
+    index = store.build_tfidf_index(str(tmp_path / "index"))
+    assert "Dev" in names(store.query("python developer", index=index))
+
+    store.remove("dev")
+    assert store.index_is_stale(index)
+
+    rows = store.query("python developer", index=index)
+    assert "Dev" not in names(rows)
+    assert {"Ana", "Cleo"} <= set(names(rows))
+
+    store.clear()
+    assert store.query("python developer", index=index) == []
+
+
+def test_rebuilt_index_is_fresh_and_adds_are_stale(tmp_path):
+    store = make_store(tmp_path)
+    index = store.build_tfidf_index(str(tmp_path / "index"))
+    assert not store.index_is_stale(index)
+
+    store.add(candidate("Eve", "Python engineer"), key="eve")
+    assert store.index_is_stale(index)
+    # New candidates rank from their skills until the index is rebuilt
+    assert "Eve" in names(store.query("python developer", index=index))
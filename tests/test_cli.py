@@ -0,0 +1,60 @@
+import csv
+
+import openpyxl
+from docx import Document
+
+from cli import main, write_results
+
+
+def row(job, rank, name, score):
+    return {
+        "Job": job, "Rank": rank, "Candidate": name, "Matching Percentage": score,
+        "Phone": "", "Email": f"{name.lower()}@example.com",
+        "Matched Skills": "python", "Missing Skills": "—", "File": f"{name}.pdf"
+    }
+
+
+def test_xlsx_output_has_one_results_sheet_per_jd(tmp_path):
+    path = str(tmp_path / "out.xlsx")
+    rows = [
+        row("backend", 1, "Ana", 80.0), row("backend", 2, "Ben", 60.0),
+        row("frontend", 1, "Ben", 70.0),
+    ]
+
+    assert write_results(iter(rows), path, "xlsx") == 3
+
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ["backend", "backend summary", "frontend", "frontend summary"]
+
+    backend = list(workbook["backend"].values)
+    assert backend[0][:3] == ("Rank", "Candidate", "Matching Percentage")
+    assert backend[0][-1] == "File"
+    assert [r[1] for r in backend[1:]] == ["Ana", "Ben"]
+    assert [r[1] for r in list(workbook["frontend"].values)[1:]] == ["Ben"]
+
+
+def test_broken_file_is_a_failure_not_a_candidate(tmp_path, capsys):
+    resumes = tmp_path / "res"
+    resumes.mkdir()
+    (resumes / "broken.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+
+    document = Document()
+    document.add_paragraph("Maria Garcia")
+    document.add_paragraph("Senior Python developer: Django, SQL and Docker on AWS")
+    document.save(str(resumes / "maria.docx"))
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python developer with Django and SQL", encoding="utf-8")
+    out = tmp_path / "out.csv"
+
+    assert main([str(resumes), "--jd", str(jd), "-o", str(out), "--quiet"]) == 0
+
+    err = capsys.readouterr().err
+    assert "Parsed: 1  Failed: 1" in err
+    assert "broken.pdf: no text could be extracted" in err
+
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["Candidate"], r["File"]) for r in rows] == [
+        ("Maria Garcia", str(resumes / "maria.docx"))
+    ]
@@ -0,0 +1,50 @@
+import io
+
+from docx import Document
+
+from utils.pdf_parser import NamedBytesIO, compare_docx_extraction, extract_docx, extract_text
+
+
+def make_docx():
+    document = Document()
+    document.add_heading("Maria Garcia", level=0)
+    document.add_paragraph("Senior Python Developer")
+    run = document.add_paragraph().add_run("Line one")
+    run.add_break()
+    run.add_text("Line two\twith tab")
+    document.add_paragraph("")
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "Django, PostgreSQL"
+    table.cell(1, 0).text = "Employer"
+    table.cell(1, 1).text = "Acme Analytics"
+
+    document.add_paragraph("References available on request")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return NamedBytesIO(buffer.getvalue(), "resume.docx")
+
+
+def test_streamed_docx_is_compatible_with_python_docx():
+    report = compare_docx_extraction(make_docx())
+
+    assert report["compatible"], report["missing"]
+    assert report["python_docx_paragraphs"] == 4
+
+
+def test_streamed_docx_includes_table_text():
+    text = extract_docx(make_docx())
+
+    for cell in ("Skills", "Django, PostgreSQL", "Employer", "Acme Analytics"):
+        assert cell in text
+    assert "Line one\nLine two\twith tab" in text
+    assert text.index("Senior Python Developer") < text.index("Acme Analytics") \
+        < text.index("References available")
+
+
+def test_extract_text_routes_docx():
+    text, metadata = extract_text(make_docx())
+
+    assert "Maria Garcia" in text and metadata == {}
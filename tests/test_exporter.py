@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+
+import pytest
+
+from utils.exporter import (
+    EXPORT_CHUNK_ROWS, RESULT_COLUMNS, export_csv, export_jsonl, export_parquet
+)
+
+N_ROWS = 2 * EXPORT_CHUNK_ROWS + 7
+COLUMNS = ["Candidate", "Matching Percentage", "Email"]
+
+
+def records(n=N_ROWS):
+    for i in range(n):
+        yield {
+            "Job": "backend", "Candidate": f"C{i}", "Matching Percentage": float(i % 100),
+            "Email": f"c{i}@example.com", "Phone": "—",
+            "Matched Skills": "python", "Missing Skills": "—", "File": f"c{i}.pdf",
+        }
+
+
+def csv_rows(data):
+    return list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+
+
+def jsonl_rows(data):
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+def parquet_rows(data):
+    pq = pytest.importorskip("pyarrow.parquet")
+    return pq.read_table(io.BytesIO(data)).to_pylist()
+
+
+def test_csv_spans_several_chunks():
+    rows = csv_rows(export_csv(records()).getvalue())
+
+    assert len(rows) == N_ROWS
+    assert list(rows[0]) == list(next(records()))
+    assert [row["Candidate"] for row in rows[-2:]] == [f"C{N_ROWS - 2}", f"C{N_ROWS - 1}"]
+
+
+def test_jsonl_spans_several_chunks():
+    rows = jsonl_rows(export_jsonl(records()).getvalue())
+
+    assert rows == list(records())
+
+
+def test_parquet_spans_several_chunks():
+    pytest.importorskip("pyarrow")
+    rows = parquet_rows(export_parquet(records()).getvalue())
+
+    assert rows == list(records())
+
+
+@pytest.mark.parametrize("export, read", [
+    (export_csv, csv_rows), (export_jsonl, jsonl_rows), (export_parquet, parquet_rows),
+])
+def test_columns_projection(export, read):
+    if export is export_parquet:
+        pytest.importorskip("pyarrow")
+
+    rows = read(export(records(10), columns=COLUMNS).getvalue())
+
+    assert len(rows) == 10
+    assert all(list(row) == COLUMNS for row in rows)
+    assert rows[3]["Email"] == "c3@example.com"
+
+
+@pytest.mark.parametrize("export, read", [
+    (export_csv, csv_rows), (export_jsonl, jsonl_rows), (export_parquet, parquet_rows),
+])
+def test_path_and_buffer_targets_match_the_default(tmp_path, export, read):
+    if export is export_parquet:
+        pytest.importorskip("pyarrow")
+
+    expected = export(records(50)).getvalue()
+
+    path = str(tmp_path / "out")
+    assert export(records(50), path) == path
+    with open(path, "rb") as f:
+        assert read(f.read()) == read(expected)
+
+    buffer = io.BytesIO()
+    assert export(records(50), buffer) is buffer
+    assert not buffer.closed
+    assert read(buffer.getvalue()) == read(expected)
+
+
+def test_empty_input():
+    assert csv_rows(export_csv(iter([])).getvalue()) == []
+    assert export_csv(iter([])).getvalue().decode("utf-8").strip() == ",".join(RESULT_COLUMNS)
+    assert export_csv(iter([]), columns=COLUMNS).getvalue().decode("utf-8").strip() == (
+        ",".join(COLUMNS)
+    )
+
+    assert export_jsonl(iter([])).getvalue() == b""
+
+
+def test_empty_parquet_keeps_the_columns():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    default = pq.read_table(export_parquet(iter([])))
+    assert default.num_rows == 0 and default.column_names == RESULT_COLUMNS
+
+    projected = pq.read_table(export_parquet(iter([]), columns=COLUMNS))
+    assert projected.num_rows == 0 and projected.column_names == COLUMNS
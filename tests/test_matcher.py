@@ -0,0 +1,193 @@
+import random
+import re
+
+import numpy as np
+import pytest
+import spacy
+
+import utils.matcher as matcher
+import utils.text_cleaner as text_cleaner
+from utils.matcher import (
+    SKILL_ONTOLOGY, SKILL_WEIGHTS, ResumePool, extract_jd_skills, extract_name_by_font,
+    find_ontology_skills, is_valid_name, iter_analyze_resumes, rank_parsed_candidates,
+    rank_parsed_candidates_multi
+)
+from utils.pdf_parser import NamedBytesIO
+from utils.text_cleaner import clean_text
+
+
+# ===============================
+# REFERENCE IMPLEMENTATIONS
+# ===============================
+def per_skill_regex_skills(text):
+    """The original matcher: one word-bounded regex per ontology skill"""
+    text = text.lower()
+    return {
+        skill
+        for domain in SKILL_ONTOLOGY.values()
+        for skill in domain
+        if re.search(r'\b' + re.escape(skill) + r'\b', text)
+    }
+
+
+def per_character_name_by_font(font_data):
+    """The original per-character font grouping + name search"""
+    font_groups = {}
+    current_text = ""
+    current_size = None
+
+    for char_info in font_data:
+        char = char_info.get('text', '')
+        size = round(char_info.get('size', 0), 1)
+
+        if current_size is None:
+            current_size = size
+
+        if abs(size - current_size) < 0.5:
+            current_text += char
+        else:
+            if current_text.strip():
+                font_groups.setdefault(current_size, []).append(current_text.strip())
+            current_text = char
+            current_size = size
+
+    if current_text.strip():
+        font_groups.setdefault(current_size, []).append(current_text.strip())
+
+    if not font_groups:
+        return None
+
+    for text_chunk in font_groups[max(font_groups)]:
+        words = text_chunk.split()
+        for i in range(len(words)):
+            for length in [4, 3, 2]:
+                if i + length <= len(words):
+                    potential_name = " ".join(words[i:i + length])
+                    if is_valid_name(potential_name):
+                        return potential_name.title()
+
+    return None
+
+
+def synthetic_candidates(n, seed):
+    rng = random.Random(seed)
+    words = list(SKILL_WEIGHTS) + "team project build system data senior engineer".split() * 10
+    candidates = []
+
+    for i in range(n):
+        raw = " ".join(rng.choice(words) for _ in range(rng.randint(0, 120)))
+        candidates.append({
+            "raw_text": raw, "clean_text": raw.lower(), "name": f"C{i}",
+            "email": "", "phone": "", "skills": sorted(find_ontology_skills(raw)),
+        })
+
+    return candidates
+
+
+JD = "Python Django SQL Docker AWS React developer, machine learning, team player " * 2
+
+
+# ===============================
+# TESTS
+# ===============================
+def test_trie_matcher_equals_per_skill_regex():
+    rng = random.Random(1)
+    terms = list(SKILL_WEIGHTS)
+    glue = [" ", ", ", ".", "/", "-", "_", "x", "(", ") ", "\n", "", "+", "#"]
+
+    for _ in range(150):
+        text = "".join(
+            rng.choice(terms) + rng.choice(glue) for _ in range(rng.randint(1, 15))
+        )
+        if rng.random() < 0.5:
+            text = text.upper()
+        assert find_ontology_skills(text) == per_skill_regex_skills(text), text
+
+
+def test_resume_pool_equals_full_ranking():
+    candidates = synthetic_candidates(300, seed=2)
+    expected = rank_parsed_candidates(candidates, extract_jd_skills(JD), clean_text(JD))
+
+    assert ResumePool(candidates).rank(JD) == expected
+
+
+def test_multi_jd_ranking_equals_one_jd_at_a_time():
+    candidates = synthetic_candidates(200, seed=5)
+    other = "Java Spring Kotlin microservices, project lead, senior engineer data systems"
+    rankings = rank_parsed_candidates_multi(candidates, {"a": JD, "b": other})
+
+    for name, jd in (("a", JD), ("b", other)):
+        expected = rank_parsed_candidates(candidates, extract_jd_skills(jd), clean_text(jd))
+        assert rankings[name] == expected
+    # Another JD in the run never changes a JD's scores
+    assert rank_parsed_candidates_multi(candidates, {"a": JD})["a"] == rankings["a"]
+
+
+@pytest.mark.parametrize("limit", [0, 1, 25, 299, 500])
+def test_top_k_pruning_equals_truncated_full_ranking(limit):
+    candidates = synthetic_candidates(300, seed=3)
+    full = ResumePool(candidates).rank(JD)
+
+    assert ResumePool(candidates).rank(JD, limit=limit) == full[:limit]
+
+
+@pytest.mark.parametrize("min_score", [20, 45, 70])
+def test_min_score_pruning_equals_filtered_full_ranking(min_score):
+    candidates = synthetic_candidates(300, seed=4)
+    pool = ResumePool(candidates)
+    full = pool.rank(JD)
+    shortlist = [row for row in full if row["Matching Percentage"] >= min_score]
+
+    assert pool.rank(JD, min_score=min_score) == shortlist
+    assert pool.rank(JD, limit=5, min_score=min_score) == shortlist[:5]
+
+
+def test_font_grouping_equals_per_character_loop():
+    rng = random.Random(5)
+    words = ["John", "Smith", "Maria", "Garcia", "Senior", "Engineer", "Resume",
+             "Python", "Developer", "Lee", "Ana", "de", "Souza", "|", "2021"]
+    sizes = [9.0, 10.0, 10.24, 10.25, 10.26, 10.45, 10.55, 11.0, 14.0, 14.3, 14.45, 18.0, 22.05]
+    names_found = 0
+
+    for _ in range(2000):
+        text, char_sizes = "", []
+        for _ in range(rng.randint(1, 12)):
+            word = rng.choice(words) + rng.choice([" ", " ", "\n"])
+            size = rng.choice(sizes)
+            for ch in word:
+                text += ch
+                char_sizes.append(size if rng.random() > 0.1 else rng.choice(sizes))
+
+        font_data = [{"text": ch, "size": size} for ch, size in zip(text, char_sizes)]
+        expected = per_character_name_by_font(font_data)
+
+        assert extract_name_by_font(text, np.array(char_sizes)) == expected, (text, char_sizes)
+        names_found += expected is not None
+
+    # The cases exercise the name search too, not only empty groups
+    assert names_found > 50
+
+
+def test_streaming_events_arrive_before_the_batch_is_extracted(monkeypatch):
+    # A trained tagger buffers a whole nlp.pipe batch before returning any doc
+    nlp = spacy.blank("en")
+    nlp.add_pipe("tagger").add_label("NN")
+    nlp.initialize()
+    monkeypatch.setattr(text_cleaner, "get_nlp", lambda: nlp)
+    monkeypatch.setattr(text_cleaner, "CLEANER_BACKEND", "spacy")
+
+    extracted = []
+
+    def extract(file):
+        extracted.append(file.name)
+        return f"Jane Doe python django developer {file.name}", {}
+
+    monkeypatch.setattr(matcher, "extract_resume_text", extract)
+    files = [NamedBytesIO(b"", f"r{i}.pdf") for i in range(20)]
+
+    events = iter_analyze_resumes(files, JD)
+    first = next(events)
+
+    assert first["type"] == "candidate"
+    assert len(extracted) < 5
+    assert [e["type"] for e in events][-1] == "final"
@@ -0,0 +1,108 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+from reportlab.pdfgen import canvas
+
+import utils.pdf_parser as pdf_parser
+from utils.pdf_parser import (
+    NamedBytesIO, PDF_BACKENDS, extract_pdf, read_pdf_pages, read_pdf_pages_fast
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESUME_LINES = [
+    "Maria Garcia",
+    "Senior Python Developer - Django, PostgreSQL, Docker",
+    "Built data pipelines on AWS for an analytics team of twelve",
+]
+
+
+def make_pdf(pages):
+    """PDF with one page per list of (font size, text) lines; None = vector-only page"""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+
+    for lines in pages:
+        if lines is None:
+            # Outlined text: shapes only, no text layer and no image objects
+            for x in range(72, 500, 24):
+                pdf.rect(x, 700, 16, 20, fill=1)
+        else:
+            y = 760
+            for size, line in lines:
+                pdf.setFont("Helvetica", size)
+                pdf.drawString(72, y, line)
+                y -= size + 8
+        pdf.showPage()
+
+    pdf.save()
+    return NamedBytesIO(buffer.getvalue(), "resume.pdf")
+
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS)
+def test_text_poor_pdf_without_images_is_ocrd(monkeypatch, backend):
+    calls = []
+
+    def fake_ocr(file, page_numbers=None):
+        calls.append(list(page_numbers))
+        return {number: "\n".join(RESUME_LINES) for number in page_numbers}
+
+    monkeypatch.setattr(pdf_parser, "OCR_ENABLED", True)
+    monkeypatch.setattr(pdf_parser, "ocr_pdf_pages", fake_ocr)
+
+    text, metadata = extract_pdf(make_pdf([None, None]), backend=backend)
+
+    assert calls == [[1, 2]]
+    assert "Senior Python Developer" in text
+    # Page 1 was OCR'd: its (empty) text layer says nothing about the header
+    assert metadata == {}
+
+
+def test_text_pdf_is_not_ocrd(monkeypatch):
+    monkeypatch.setattr(pdf_parser, "OCR_ENABLED", True)
+    monkeypatch.setattr(pdf_parser, "ocr_pdf_pages", lambda *args: pytest.fail("OCR ran"))
+
+    text, metadata = extract_pdf(make_pdf([[(11, line) for line in RESUME_LINES]]))
+
+    assert "Maria Garcia" in text
+    assert metadata["font_text"].startswith("Maria Garcia")
+
+
+def import_with_backend(value):
+    env = dict(os.environ, RESUME_PDF_BACKEND=value)
+    return subprocess.run(
+        [sys.executable, "-c", "import utils.pdf_parser as p; print(p.PDF_BACKEND)"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def test_env_backend_is_applied():
+    result = import_with_backend("pdfminer")
+    assert result.returncode == 0
+    assert result.stdout.strip().endswith("pdfminer")
+
+
+def test_unknown_env_backend_is_rejected():
+    result = import_with_backend("PDFMiner")
+    assert result.returncode != 0
+    assert "Unknown PDF backend: 'PDFMiner'" in result.stderr
+
+
+def test_fast_text_device_matches_pdfplumber():
+    pages = [
+        [(20, RESUME_LINES[0])] + [(11, line) for line in RESUME_LINES[1:]],
+        [(11, "Experience: Acme Corp, 2019 - 2024"), (9, "References available on request")],
+    ]
+
+    texts, ocr_pages, font_text, font_sizes = read_pdf_pages(make_pdf(pages))
+    fast = read_pdf_pages_fast(make_pdf(pages))
+
+    assert fast[0] == texts
+    assert fast[1] == ocr_pages == []
+    # Page 1 only, one size per character: the name line is the 20 pt run
+    assert fast[2] == font_text
+    assert list(fast[3]) == pytest.approx(list(font_sizes))
+    assert font_text.startswith("Maria Garcia") and font_sizes[0] == 20
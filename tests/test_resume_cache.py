@@ -0,0 +1,25 @@
+from utils.resume_cache import ResumeCache
+
+
+def test_versions_share_a_file_without_evicting_each_other(tmp_path):
+    path = str(tmp_path / "resumes.db")
+    app = ResumeCache(path, version="pdfplumber")
+    cli = ResumeCache(path, version="pdfminer")
+
+    app.put("hash", {"backend": "pdfplumber"})
+    assert cli.get("hash") is None
+
+    cli.put("hash", {"backend": "pdfminer"})
+    assert app.get("hash") == {"backend": "pdfplumber"}
+    assert cli.get("hash") == {"backend": "pdfminer"}
+
+
+def test_other_versions_age_out_by_lru(tmp_path):
+    path = str(tmp_path / "resumes.db")
+    old = ResumeCache(path, version="old")
+    old.put("a", {"text": "x" * 1000})
+
+    new = ResumeCache(path, version="new", max_bytes=1)
+    new.put("b", {"text": "y"})
+
+    assert old.get("a") is None
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import utils.text_cleaner as text_cleaner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_with_backend(value):
+    env = dict(os.environ, RESUME_CLEANER_BACKEND=value)
+    return subprocess.run(
+        [sys.executable, "-c", "import utils.text_cleaner as t; print(t.CLEANER_BACKEND)"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def test_env_backend_is_applied():
+    result = import_with_backend("fast")
+    assert result.returncode == 0
+    assert result.stdout.strip() == "fast"
+
+
+def test_unknown_env_backend_is_rejected():
+    result = import_with_backend("Fast")
+    assert result.returncode != 0
+    assert "Unknown cleaner backend: 'Fast'" in result.stderr
+
+
+def test_comparison_refuses_fallback_reference(monkeypatch):
+    monkeypatch.setattr(text_cleaner, "get_nlp", lambda: None)
+    with pytest.raises(RuntimeError):
+        text_cleaner.compare_cleaning_backends(["Senior Python developer"])
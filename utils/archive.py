@@ -0,0 +1,207 @@
+import os
+import tarfile
+import zipfile
+import zlib
+
+from utils.pdf_parser import NamedBytesIO
+
+# ===============================
+# ARCHIVE INGESTION (ZIP / TAR)
+# ===============================
+# Bulk exports are read member by member straight from the archive:
+# nothing is extracted to disk and only the member being handed out is
+# held in memory (as a NamedBytesIO that extract_text accepts)
+RESUME_EXTENSIONS = (".pdf", ".docx")
+# Any .gz is opened as a (gzipped) TAR; a gzipped single file is an error entry
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# A resume is never this big - larger members are skipped, not loaded
+MAX_MEMBER_BYTES = 50 * 1024 * 1024
+
+# Corrupt / truncated archives, non-archives with an archive extension,
+# bad CRCs, encrypted or unsupported members
+ARCHIVE_ERRORS = (
+    tarfile.TarError, zipfile.BadZipFile, zlib.error, EOFError, OSError,
+    ValueError, RuntimeError, NotImplementedError
+)
+
+
+class UnreadableResume:
+    """
+    Stand-in for an archive (or member) that could not be read. It goes
+    through the parsing pipeline like any file, and reading it raises the
+    original error, so it ends up as that file's error result instead of
+    stopping the batch.
+    """
+
+    def __init__(self, name, error):
+        self.name = name
+        self.error = error
+
+    def raise_error(self, *args, **kwargs):
+        raise ValueError(f"unreadable archive entry: {self.error}")
+
+    read = getvalue = seek = raise_error
+
+
+def is_resume_name(name):
+    return name.lower().endswith(RESUME_EXTENSIONS)
+
+
+def is_archive_name(name):
+    return name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _source_name(source):
+    return source if isinstance(source, str) else getattr(source, "name", "")
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def _wanted_member(name, size, warn=True):
+    """PDF/DOCX members only, skipping OS metadata and oversized entries"""
+    base = os.path.basename(name)
+    if "__MACOSX/" in name or base.startswith("._") or not is_resume_name(base):
+        return False
+
+    if size > MAX_MEMBER_BYTES:
+        if warn:
+            print(f"⚠️ Skipping {name}: larger than {MAX_MEMBER_BYTES // (1024 * 1024)} MB")
+        return False
+
+    return True
+
+
+def _open_tar(source, mode):
+    if isinstance(source, str):
+        return tarfile.open(source, mode)
+    return tarfile.open(fileobj=source, mode=mode)
+
+
+def iter_archive_resumes(source):
+    """
+    Yield every PDF/DOCX member of a ZIP or TAR (plain or compressed) as a
+    NamedBytesIO, one at a time. source is a path or a binary file object.
+    TARs are read in stream mode, so compressed tarballs are decompressed
+    once, front to back.
+    A member that cannot be read is yielded as an UnreadableResume; so is
+    an archive that cannot be opened, or the rest of a truncated TAR.
+    """
+    name = _source_name(source)
+
+    try:
+        _rewind(source)
+        is_zip = zipfile.is_zipfile(source)
+        _rewind(source)
+
+        if is_zip:
+            archive = zipfile.ZipFile(source)
+        else:
+            archive = _open_tar(source, "r|*")
+    except ARCHIVE_ERRORS as e:
+        yield UnreadableResume(name, e)
+        return
+
+    if is_zip:
+        with archive:
+            yield from _iter_zip_members(archive)
+    else:
+        with archive:
+            yield from _iter_tar_members(archive, name)
+
+
+def _iter_zip_members(archive):
+    for info in archive.infolist():
+        if info.is_dir() or not _wanted_member(info.filename, info.file_size):
+            continue
+
+        try:
+            data = archive.read(info)
+        except ARCHIVE_ERRORS as e:
+            yield UnreadableResume(info.filename, e)
+            continue
+
+        yield NamedBytesIO(data, info.filename)
+
+
+def _iter_tar_members(archive, name):
+    members = iter(archive)
+
+    while True:
+        try:
+            member = next(members, None)
+            if member is None:
+                return
+            if not member.isfile() or not _wanted_member(member.name, member.size):
+                continue
+            data = archive.extractfile(member).read()
+        except ARCHIVE_ERRORS as e:
+            # A stream cannot skip past damage: the rest of the TAR is lost
+            yield UnreadableResume(name, e)
+            return
+
+        yield NamedBytesIO(data, member.name)
+
+
+def count_archive_resumes(source):
+    """
+    Number of items iter_archive_resumes will yield (headers only). An
+    archive that cannot be opened or read through counts its error entry;
+    for a truncated TAR this is an upper bound (the damaged member's header
+    counts, but iteration only yields the error entry for it).
+    """
+    count = 0
+
+    try:
+        _rewind(source)
+        if zipfile.is_zipfile(source):
+            _rewind(source)
+            with zipfile.ZipFile(source) as archive:
+                return sum(
+                    1 for info in archive.infolist()
+                    if not info.is_dir() and _wanted_member(info.filename, info.file_size, warn=False)
+                )
+
+        _rewind(source)
+        with _open_tar(source, "r:*") as archive:
+            for member in archive:
+                if member.isfile() and _wanted_member(member.name, member.size, warn=False):
+                    count += 1
+            return count
+
+    except ARCHIVE_ERRORS:
+        return count + 1
+
+    finally:
+        _rewind(source)
+
+
+class ResumeSources:
+    """
+    Lazy sequence of resumes from plain files and archives (mixed).
+    Iterating expands archives member by member; len() counts members
+    from the archive headers without loading them (or returns `length`,
+    if the caller already knows it).
+    """
+
+    def __init__(self, sources, length=None):
+        self.sources = list(sources)
+        self._length = length
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(
+                count_archive_resumes(source) if is_archive_name(_source_name(source)) else 1
+                for source in self.sources
+            )
+        return self._length
+
+    def __iter__(self):
+        for source in self.sources:
+            if is_archive_name(_source_name(source)):
+                yield from iter_archive_resumes(source)
+            else:
+                yield source
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from utils.matcher import (
+    SKILL_WEIGHTS, extract_jd_skills, find_ontology_skills,
+    result_row, score_matrix, select_ranked
+)
+from utils.resume_cache import content_hash
+from utils.text_cleaner import clean_text
+from utils.tfidf_index import build_tfidf_index
+
+# ===============================
+# PERSISTENT CANDIDATE STORE
+# ===============================
+# The talent pool kept between runs (SQLite). Every stored resume's
+# ontology skills form an inverted index, skill -> (candidate id, weight),
+# so a JD is ranked by merging the posting lists of its skills, without
+# reading any resume text. Posting lists are loaded once per skill and
+# kept in memory until the store changes.
+DEFAULT_STORE_PATH = os.getenv("RESUME_STORE_PATH", ".resume_cache/candidates.db")
+
+
+def ontology_version():
+    """Stamp of the skill ontology the postings were mined with"""
+    ontology = json.dumps(SKILL_WEIGHTS, sort_keys=True)
+    return hashlib.sha256(ontology.encode("utf-8")).hexdigest()[:16]
+
+
+def _pack(text):
+    return zlib.compress((text or "").encode("utf-8"))
+
+
+def _unpack(payload):
+    return zlib.decompress(payload).decode("utf-8")
+
+
+class CandidateStore:
+    """
+    On-disk candidate pool with an inverted skill index.
+    - add / add_many: store parsed candidates (as parse_candidates returns),
+      deduplicated by key (default: hash of the raw text)
+    - query: rank every stored candidate against a JD from postings alone
+    Postings carry a weight (1.0 per detected skill; scoring uses it as
+    the candidate's matched share of that skill). If the ontology changed
+    since they were written, postings are re-mined from the stored text.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._postings = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                phone TEXT NOT NULL,
+                raw_text BLOB NOT NULL,
+                clean_text BLOB NOT NULL,
+                added REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                skill TEXT NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (skill, candidate_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_candidate ON postings(candidate_id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+        if self._meta("ontology") != ontology_version():
+            self.reindex()
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def _bump_generation(self):
+        """Count a change of the stored pool (lock held, before commit)"""
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def generation(self):
+        """Change counter of the stored pool (shared by every process using the file)"""
+        with self._lock:
+            return int(self._meta("generation") or 0)
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    # ---------- writes ----------
+    def add(self, candidate, key=None):
+        """Store one candidate; returns its id"""
+        return self.add_many([candidate], [key] if key else None)[0]
+
+    def add_many(self, candidates, keys=None):
+        """
+        Store candidates in one transaction; returns their ids.
+        keys: per-candidate dedup keys (e.g. file content hashes). A known
+        key replaces the stored candidate and keeps its id.
+        """
+        ids = []
+
+        with self._lock:
+            for i, candidate in enumerate(candidates):
+                key = keys[i] if keys else content_hash(candidate["raw_text"].encode("utf-8"))
+                row = (
+                    candidate["name"], candidate["email"] or "", candidate["phone"] or "",
+                    _pack(candidate["raw_text"]), _pack(candidate["clean_text"]), time.time()
+                )
+
+                existing = self._conn.execute(
+                    "SELECT id FROM candidates WHERE key = ?", (key,)
+                ).fetchone()
+
+                if existing:
+                    candidate_id = existing[0]
+                    self._conn.execute(
+                        "UPDATE candidates SET name = ?, email = ?, phone = ?, raw_text = ?, "
+                        "clean_text = ?, added = ? WHERE id = ?", (*row, candidate_id)
+                    )
+                    self._conn.execute(
+                        "DELETE FROM postings WHERE candidate_id = ?", (candidate_id,)
+                    )
+                else:
+                    candidate_id = self._conn.execute(
+                        "INSERT INTO candidates (key, name, email, phone, raw_text, clean_text, added) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", (key, *row)
+                    ).lastrowid
+
+                self._conn.executemany(
+                    "INSERT INTO postings (skill, candidate_id, weight) VALUES (?, ?, 1.0)",
+                    [(skill, candidate_id) for skill in candidate["skills"]]
+                )
+                ids.append(candidate_id)
+
+            self._bump_generation()
+            self._conn.commit()
+            self._postings.clear()
+
+        return ids
+
+    def remove(self, key):
+        """Drop a candidate by key"""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM candidates WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM postings WHERE candidate_id = ?", (row[0],))
+            self._conn.execute("DELETE FROM candidates WHERE id = ?", row)
+            self._bump_generation()
+            self._conn.commit()
+            self._postings.clear()
+
+    def reindex(self):
+        """Re-mine every candidate's postings with the current ontology"""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+
+            rows = self._conn.execute("SELECT id, raw_text FROM candidates").fetchall()
+            for candidate_id, raw_text in rows:
+                self._conn.executemany(
+                    "INSERT INTO postings (skill, candidate_id, weight) VALUES (?, ?, 1.0)",
+                    [(skill, candidate_id) for skill in find_ontology_skills(_unpack(raw_text))]
+                )
+
+            self._set_meta("ontology", ontology_version())
+            self._bump_generation()
+            self._conn.commit()
+            self._postings.clear()
+
+        if rows:
+            print(f"⚠️ Skill ontology changed: re-indexed {len(rows)} stored candidates")
+
+    def clear(self):
+        """Remove every candidate"""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM candidates")
+            self._bump_generation()
+            self._conn.commit()
+            self._postings.clear()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- reads ----------
+    def posting_list(self, skill):
+        """(candidate ids, weights) holding a skill, ids ascending"""
+        with self._lock:
+            posting = self._postings.get(skill)
+            if posting is None:
+                rows = self._conn.execute(
+                    "SELECT candidate_id, weight FROM postings WHERE skill = ? ORDER BY candidate_id",
+                    (skill,)
+                ).fetchall()
+                data = np.array(rows, dtype=np.float64).reshape(-1, 2)
+                posting = (data[:, 0].astype(np.int64), data[:, 1])
+                self._postings[skill] = posting
+
+        return posting
+
+    def skill_matrix(self, skills, extra_ids=None):
+        """
+        Merge the posting lists of `skills` into (candidate ids, N x len(skills)
+        CSR of posting weights) over every candidate holding at least one,
+        plus `extra_ids` (rows without postings)
+        """
+        postings = [self.posting_list(skill) for skill in skills]
+        ids = np.concatenate([p[0] for p in postings]) if postings else np.zeros(0, np.int64)
+        weights = np.concatenate([p[1] for p in postings]) if postings else np.zeros(0)
+        columns = np.repeat(np.arange(len(skills)), [len(p[0]) for p in postings])
+
+        all_ids = ids if extra_ids is None else np.concatenate([ids, extra_ids])
+        candidate_ids, rows = np.unique(all_ids, return_inverse=True)
+        matrix = csr_matrix(
+            (weights, (rows[:len(ids)], columns)), shape=(len(candidate_ids), len(skills))
+        )
+        matrix.sort_indices()
+        return candidate_ids, matrix
+
+    def texts(self):
+        """(candidate ids, cleaned texts) of every stored candidate, by id"""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, clean_text FROM candidates ORDER BY id").fetchall()
+        return [row[0] for row in rows], [_unpack(row[1]) for row in rows]
+
+    def build_tfidf_index(self, directory):
+        """Write a memory-mapped TF-IDF index of every stored resume (see TfidfIndex)"""
+        generation = self.generation()
+        ids, texts = self.texts()
+        return build_tfidf_index(directory, texts, ids, meta={"store_generation": generation})
+
+    def index_is_stale(self, index):
+        """True if candidates were added, replaced or removed since `index` was built"""
+        return index.meta.get("store_generation") != self.generation()
+
+    def stored_ids(self):
+        """Ids of every stored candidate, ascending"""
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM candidates ORDER BY id").fetchall()
+        return np.array([row[0] for row in rows], dtype=np.int64)
+
+    def candidates(self, candidate_ids):
+        """{id: candidate dict (name / email / phone)} for the given ids"""
+        found = {}
+        candidate_ids = [int(i) for i in candidate_ids]
+
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[start:start + 500]
+            query = (
+                "SELECT id, name, email, phone FROM candidates "
+                f"WHERE id IN ({','.join('?' * len(chunk))})"
+            )
+            with self._lock:
+                for candidate_id, name, email, phone in self._conn.execute(query, chunk):
+                    found[candidate_id] = {"name": name, "email": email, "phone": phone}
+
+        return found
+
+    def query(self, job_desc, limit=None, min_score=None, index=None):
+        """
+        Ranked result rows (as analyze_resumes returns) for every stored
+        candidate with at least one of the JD's skills. No resume text is
+        read: without `index` the semantic term is 0 and scores come from
+        the skill postings only. With a TfidfIndex the semantic term is its
+        cosine, and candidates it finds similar are ranked too. A stale
+        index still works: removed candidates are ignored and new ones get
+        a cosine of 0 until it is rebuilt.
+        Ties keep insertion order.
+        """
+        jd_skills = extract_jd_skills(job_desc)
+        if not jd_skills and index is None:
+            return []
+
+        skills = list(jd_skills)
+        weights = np.array([jd_skills[skill] for skill in skills], dtype=float)
+
+        similar_ids = similarities = None
+        if index is not None:
+            similarities = index.similarities(clean_text(job_desc))
+            similar_ids = index.ids[similarities > 0]
+            if self.index_is_stale(index):
+                similar_ids = similar_ids[np.isin(similar_ids, self.stored_ids())]
+
+        candidate_ids, matrix = self.skill_matrix(skills, similar_ids)
+        if not len(candidate_ids):
+            return []
+
+        semantic = np.zeros(len(candidate_ids))
+        if index is not None and len(index):
+            # Index columns are in id order; ids added since the build get 0
+            positions = np.searchsorted(index.ids, candidate_ids)
+            positions = np.minimum(positions, len(index.ids) - 1)
+            indexed = index.ids[positions] == candidate_ids
+            semantic[indexed] = similarities[positions[indexed]]
+
+        scores = score_matrix(matrix, weights, skills, semantic)
+        order = select_ranked(scores, np.arange(len(scores)), limit, min_score)
+
+        # Rows removed meanwhile (e.g. by another process) are skipped
+        found = self.candidates(candidate_ids[order])
+        return [
+            result_row(found[int(candidate_ids[row])], scores[row], matrix, row, skills)
+            for row in order
+            if int(candidate_ids[row]) in found
+        ]
@@ -1,10 +1,36 @@
+import csv
 import io
+import json
+import re
+from itertools import chain, islice
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from datetime import datetime
 
+# ===============================
+# OPTIONAL PARQUET SUPPORT
+# ===============================
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_ENABLED = True
+except ImportError:
+    PARQUET_ENABLED = False
+
+RESULT_COLUMNS = [
+    "Candidate",
+    "Matching Percentage",
+    "Phone",
+    "Email",
+    "Matched Skills",
+    "Missing Skills"
+]
+SCORE_COLUMN = "Matching Percentage"
+
 # ===============================
 # MAIN EXCEL EXPORT (ENHANCED)
 # ===============================
@@ -16,131 +42,168 @@ def export_excel(df, job_role="Resume Screening"):
     - Auto-adjusted column widths
     - Headers with styling
     - Metadata sheet
+    Written in write-only mode (rows are streamed, not kept as cell
+    objects) with shared named styles and conditional-formatting rules.
     """
     buffer = io.BytesIO()
-    
-    # Create Excel with multiple sheets
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        # Main results sheet
-        df[
-            [
-                "Candidate",
-                "Matching Percentage",
-                "Phone",
-                "Email",
-                "Matched Skills",
-                "Missing Skills"
-            ]
-        ].to_excel(writer, sheet_name="Results", index=False)
-        
-        # Summary statistics sheet
-        create_summary_sheet(writer, df, job_role)
-        
-        # Get workbook to apply formatting
-        workbook = writer.book
-        worksheet = workbook["Results"]
-        
-        # Apply professional styling
-        apply_excel_formatting(worksheet, df)
-    
+
+    workbook = Workbook(write_only=True)
+    register_excel_styles(workbook)
+
+    # Main results sheet
+    worksheet = workbook.create_sheet("Results")
+    write_results_sheet(worksheet, df[RESULT_COLUMNS])
+
+    # Summary statistics sheet
+    create_summary_sheet(workbook, df, job_role)
+
+    workbook.save(buffer)
     buffer.seek(0)
     return buffer
 
+def export_excel_jobs(frames):
+    """
+    One workbook for several job descriptions ({job name: results df}):
+    a results sheet (with the Rank and File columns if present) and a
+    summary sheet per job, so rows of different JDs never mix.
+    """
+    buffer = io.BytesIO()
+
+    workbook = Workbook(write_only=True)
+    register_excel_styles(workbook)
+
+    used = set()
+    for job, df in frames.items():
+        title = sheet_title(job, used)
+        columns = [c for c in ["Rank"] + RESULT_COLUMNS + ["File"] if c in df.columns]
+
+        worksheet = workbook.create_sheet(title)
+        write_results_sheet(worksheet, df[columns])
+        create_summary_sheet(workbook, df, job, title=sheet_title(f"{title} summary", used))
+
+    if not frames:
+        write_results_sheet(workbook.create_sheet("Results"), pd.DataFrame(columns=RESULT_COLUMNS))
+
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+# Characters Excel does not allow in sheet names (max 31 characters)
+_SHEET_TITLE_RE = re.compile(r"[\\/*?:\[\]]")
+
+def sheet_title(name, used):
+    """Valid, unique (within `used`) sheet name for a job"""
+    base = _SHEET_TITLE_RE.sub("_", str(name)).strip("'") or "Results"
+    title, n = base[:31], 1
+    while title.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+    used.add(title.lower())
+    return title
+
 # ===============================
-# EXCEL FORMATTING 
+# EXCEL FORMATTING
 # ===============================
-def apply_excel_formatting(worksheet, df):
+# Score bands: one worksheet rule each instead of a fill per cell
+SCORE_BANDS = [
+    (80, "C6EFCE"),  # 80-100%: green
+    (60, "FFEB9C"),  # 60-79%:  yellow
+    (40, "FFC7CE"),  # 40-59%:  orange
+    (None, "FF9999"),  # <40%:  red
+]
+
+def register_excel_styles(workbook):
     """
-    Apply professional Excel formatting:
-    - Header styling (bold, background color)
-    - Color-coded matching percentages
-    - Auto-adjust column widths
-    - Borders and alignment
+    Shared named styles (one style record each, referenced by every cell):
+    - header: bold white on blue, centered
+    - cell:   thin borders, wrapped text
+    - score:  bold, centered, shown as a percentage
     """
-    
-    # Define colors
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    
-    green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")  # 80-100%
-    yellow_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")  # 60-79%
-    orange_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")  # 40-59%
-    red_fill = PatternFill(start_color="FF9999", end_color="FF9999", fill_type="solid")     # <40%
-    
     border = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
-    
-    # Format header row
-    for cell in worksheet[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
-    
-    # Format data rows
-    for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=worksheet.max_row), start=2):
-        for col_idx, cell in enumerate(row, start=1):
-            cell.border = border
-            cell.alignment = Alignment(vertical="center", wrap_text=True)
-            
-            # Column B is "Matching Percentage" - color code it
-            if col_idx == 2:  # Matching Percentage column
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.font = Font(bold=True, size=11)
-                
-                try:
-                    score = float(cell.value)
-                    
-                    # Color code based on score
-                    if score >= 80:
-                        cell.fill = green_fill
-                    elif score >= 60:
-                        cell.fill = yellow_fill
-                    elif score >= 40:
-                        cell.fill = orange_fill
-                    else:
-                        cell.fill = red_fill
-                    
-                    # Format as percentage
-                    cell.number_format = '0.00"%"'
-                
-                except (ValueError, TypeError):
-                    pass
-    
-    # Auto-adjust column widths
-    auto_adjust_column_width(worksheet)
-    
-    # Freeze header row
+
+    header = NamedStyle(name="header")
+    header.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header.font = Font(bold=True, color="FFFFFF", size=12)
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    header.border = border
+
+    cell = NamedStyle(name="cell")
+    cell.alignment = Alignment(vertical="center", wrap_text=True)
+    cell.border = border
+
+    score = NamedStyle(name="score")
+    score.alignment = Alignment(horizontal="center", vertical="center")
+    score.font = Font(bold=True, size=11)
+    score.border = border
+    score.number_format = '0.00"%"'
+
+    for style in (header, cell, score):
+        workbook.add_named_style(style)
+
+def write_results_sheet(worksheet, df):
+    """Stream the result rows into a write-only sheet"""
+    columns = list(df.columns)
+    score_index = columns.index(SCORE_COLUMN) if SCORE_COLUMN in columns else None
+
+    # Sheet properties must be set before the first row is written
+    for letter, width in column_widths(df).items():
+        worksheet.column_dimensions[letter].width = width
     worksheet.freeze_panes = "A2"
 
-def auto_adjust_column_width(worksheet):
+    if score_index is not None and len(df):
+        add_score_rules(worksheet, get_column_letter(score_index + 1), len(df))
+
+    worksheet.append([styled_cell(worksheet, name, "header") for name in columns])
+
+    for values in df.itertuples(index=False, name=None):
+        worksheet.append([
+            styled_cell(worksheet, value, "score" if i == score_index else "cell")
+            for i, value in enumerate(values)
+        ])
+
+def styled_cell(worksheet, value, style):
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.style = style
+    return cell
+
+def add_score_rules(worksheet, column_letter, n_rows):
+    """Color-code the score column with one conditional rule per band"""
+    cell_range = f"{column_letter}2:{column_letter}{n_rows + 1}"
+
+    for minimum, color in SCORE_BANDS:
+        fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        if minimum is None:
+            rule = CellIsRule(operator="lessThan", formula=["40"], fill=fill, stopIfTrue=True)
+        else:
+            rule = CellIsRule(
+                operator="greaterThanOrEqual", formula=[str(minimum)], fill=fill, stopIfTrue=True
+            )
+        worksheet.conditional_formatting.add(cell_range, rule)
+
+def column_widths(df):
     """
-    Automatically adjust column widths based on content
+    {column letter: width} from the longest value (or header) per column,
+    using vectorized string lengths. Padded by 2, capped at 50.
     """
-    for column in worksheet.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            try:
-                if cell.value:
-                    cell_length = len(str(cell.value))
-                    max_length = max(max_length, cell_length)
-            except:
-                pass
-        
-        # Set width with some padding (max 50 to avoid very wide columns)
-        adjusted_width = min(max_length + 2, 50)
-        worksheet.column_dimensions[column_letter].width = adjusted_width
+    widths = {}
+
+    for i, column in enumerate(df.columns, start=1):
+        values = df[column].dropna().astype(str)
+        max_length = max(len(str(column)), int(values.str.len().max()) if len(values) else 0)
+        widths[get_column_letter(i)] = min(max_length + 2, 50)
+
+    return widths
 
 # ===============================
 # SUMMARY STATISTICS SHEET
 # ===============================
-def create_summary_sheet(writer, df, job_role):
+def create_summary_sheet(workbook, df, job_role, title="Summary"):
     """
     Create a summary sheet with statistics and insights
     """
@@ -168,23 +231,126 @@ def create_summary_sheet(writer, df, job_role):
             datetime.now().strftime("%H:%M:%S")
         ]
     }
-    
+
     summary_df = pd.DataFrame(summary_data)
-    summary_df.to_excel(writer, sheet_name="Summary", index=False)
-    
-    # Format summary sheet
-    workbook = writer.book
-    summary_sheet = workbook["Summary"]
-    
-    # Apply formatting
-    for cell in summary_sheet[1]:
-        cell.font = Font(bold=True, size=12)
-        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        cell.font = Font(bold=True, color="FFFFFF", size=12)
-    
-    # Auto-adjust columns
-    auto_adjust_column_width(summary_sheet)
+    summary_sheet = workbook.create_sheet(title)
+
+    for letter, width in column_widths(summary_df).items():
+        summary_sheet.column_dimensions[letter].width = width
+
+    summary_sheet.append([styled_cell(summary_sheet, name, "header") for name in summary_df.columns])
+    for values in summary_df.itertuples(index=False, name=None):
+        summary_sheet.append(list(values))
+
+
+# ===============================
+# STREAMING EXPORTS (CSV / JSONL / PARQUET)
+# ===============================
+# Records come from any iterable (e.g. a generator of result rows) and are
+# written EXPORT_CHUNK_ROWS at a time. target: a file path, a binary
+# buffer, or None for a new BytesIO (returned rewound).
+EXPORT_CHUNK_ROWS = 5000
+
+def iter_chunks(records, size=EXPORT_CHUNK_ROWS):
+    """Lists of up to `size` records, without reading ahead further"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+def dataframe_records(df):
+    """Row dicts of a DataFrame, one at a time"""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+def _open_binary(target):
+    """(binary file, close_when_done) for a path, a buffer or None"""
+    if target is None:
+        return io.BytesIO(), False
+    if isinstance(target, str):
+        return open(target, "wb"), True
+    return target, False
+
+def _finish(target, stream, close):
+    if close:
+        stream.close()
+        return target
+    if target is None:
+        stream.seek(0)
+    return stream
+
+def export_csv(records, target=None, columns=None):
+    """CSV (UTF-8, header row). columns default to the first record's keys"""
+    stream, close = _open_binary(target)
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    try:
+        chunks = iter_chunks(records)
+        first = next(chunks, [])
+        writer = csv.DictWriter(
+            text,
+            fieldnames=columns or (list(first[0]) if first else RESULT_COLUMNS),
+            extrasaction="ignore"
+        )
+        writer.writeheader()
 
+        for chunk in chain([first], chunks):
+            writer.writerows(chunk)
+            text.flush()
+    finally:
+        # Hand the underlying stream back instead of closing it
+        text.detach()
+
+    return _finish(target, stream, close)
+
+def export_jsonl(records, target=None, columns=None):
+    """JSON Lines: one object per record (only `columns` if given)"""
+    stream, close = _open_binary(target)
+
+    for chunk in iter_chunks(records):
+        if columns:
+            chunk = [{key: record.get(key) for key in columns} for record in chunk]
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in chunk)
+        stream.write(lines.encode("utf-8"))
+
+    return _finish(target, stream, close)
+
+def export_parquet(records, target=None, columns=None):
+    """
+    Parquet, one row group per chunk (requires the optional pyarrow).
+    The schema is taken from the first chunk.
+    """
+    if not PARQUET_ENABLED:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+
+    stream, close = _open_binary(target)
+    writer = None
+
+    try:
+        for chunk in iter_chunks(records):
+            if columns:
+                chunk = [{key: record.get(key) for key in columns} for record in chunk]
+
+            if writer is None:
+                table = pa.Table.from_pylist(chunk)
+                writer = pq.ParquetWriter(stream, table.schema)
+            else:
+                table = pa.Table.from_pylist(chunk, schema=writer.schema)
+
+            writer.write_table(table)
+
+        if writer is None:
+            # No records: still a valid (empty) file with the result columns
+            schema = pa.schema([(column, pa.string()) for column in columns or RESULT_COLUMNS])
+            writer = pq.ParquetWriter(stream, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return _finish(target, stream, close)
 
 # ===============================
 # BATCH EXPORT (ALL FORMATS)
@@ -192,11 +358,17 @@ def create_summary_sheet(writer, df, job_role):
 def export_all_formats(df, job_role="Resume Screening"):
     """
     Export in multiple formats at once
-    Returns: dict with all export buffers
+    Returns: dict with all export buffers (parquet only if pyarrow is installed)
     """
     exports = {}
-    
+
     # Excel
     exports['excel'] = export_excel(df, job_role)
-    
+
+    # Streaming formats
+    exports['csv'] = export_csv(dataframe_records(df), columns=RESULT_COLUMNS)
+    exports['jsonl'] = export_jsonl(dataframe_records(df), columns=RESULT_COLUMNS)
+    if PARQUET_ENABLED:
+        exports['parquet'] = export_parquet(dataframe_records(df), columns=RESULT_COLUMNS)
+
     return exports
@@ -0,0 +1,131 @@
+import gzip
+import json
+from functools import lru_cache
+
+# ===============================
+# OPTIONAL LEMMA LOOKUP TABLE
+# ===============================
+# spacy-lookups-data ships a plain English lemma lookup table; reading it
+# does not import spaCy. Without it a small built-in table is used.
+try:
+    import spacy_lookups_data
+    LOOKUPS_ENABLED = True
+except ImportError:
+    LOOKUPS_ENABLED = False
+
+# ===============================
+# STATIC STOP WORDS (spaCy English list, alphabetic entries)
+# ===============================
+STOP_WORDS = frozenset({
+    "a", "about", "above", "across", "after", "afterwards", "again", "against",
+    "all", "almost", "alone", "along", "already", "also", "although", "always",
+    "am", "among", "amongst", "amount", "an", "and", "another", "any",
+    "anyhow", "anyone", "anything", "anyway", "anywhere", "are", "around",
+    "as", "at", "back", "be", "became", "because", "become", "becomes",
+    "becoming", "been", "before", "beforehand", "behind", "being", "below",
+    "beside", "besides", "between", "beyond", "both", "bottom", "but", "by",
+    "ca", "call", "can", "cannot", "could", "did", "do", "does", "doing",
+    "done", "down", "due", "during", "each", "eight", "either", "eleven",
+    "else", "elsewhere", "empty", "enough", "even", "ever", "every",
+    "everyone", "everything", "everywhere", "except", "few", "fifteen",
+    "fifty", "first", "five", "for", "former", "formerly", "forty", "four",
+    "from", "front", "full", "further", "get", "give", "go", "had", "has",
+    "have", "he", "hence", "her", "here", "hereafter", "hereby", "herein",
+    "hereupon", "hers", "herself", "him", "himself", "his", "how", "however",
+    "hundred", "i", "if", "in", "indeed", "into", "is", "it", "its", "itself",
+    "just", "keep", "last", "latter", "latterly", "least", "less", "made",
+    "make", "many", "may", "me", "meanwhile", "might", "mine", "more",
+    "moreover", "most", "mostly", "move", "much", "must", "my", "myself",
+    "name", "namely", "neither", "never", "nevertheless", "next", "nine", "no",
+    "nobody", "none", "noone", "nor", "not", "nothing", "now", "nowhere", "of",
+    "off", "often", "on", "once", "one", "only", "onto", "or", "other",
+    "others", "otherwise", "our", "ours", "ourselves", "out", "over", "own",
+    "part", "per", "perhaps", "please", "put", "quite", "rather", "re",
+    "really", "regarding", "same", "say", "see", "seem", "seemed", "seeming",
+    "seems", "serious", "several", "she", "should", "show", "side", "since",
+    "six", "sixty", "so", "some", "somehow", "someone", "something",
+    "sometime", "sometimes", "somewhere", "still", "such", "take", "ten",
+    "than", "that", "the", "their", "them", "themselves", "then", "thence",
+    "there", "thereafter", "thereby", "therefore", "therein", "thereupon",
+    "these", "they", "third", "this", "those", "though", "three", "through",
+    "throughout", "thru", "thus", "to", "together", "too", "top", "toward",
+    "towards", "twelve", "twenty", "two", "under", "unless", "until", "up",
+    "upon", "us", "used", "using", "various", "very", "via", "was", "we",
+    "well", "were", "what", "whatever", "when", "whence", "whenever", "where",
+    "whereafter", "whereas", "whereby", "wherein", "whereupon", "wherever",
+    "whether", "which", "while", "whither", "who", "whoever", "whole", "whom",
+    "whose", "why", "will", "with", "within", "without", "would", "yet", "you",
+    "your", "yours", "yourself", "yourselves"
+})
+
+# ===============================
+# BUILT-IN LEMMA TABLE
+# ===============================
+# Common resume vocabulary whose lemma a suffix rule would get wrong
+LEMMA_TABLE = {
+    "built": "build", "building": "build", "builds": "build",
+    "developed": "develop", "developing": "develop", "develops": "develop",
+    "managed": "manage", "managing": "manage", "manages": "manage",
+    "created": "create", "creating": "create", "creates": "create",
+    "designed": "design", "designing": "design", "designs": "design",
+    "implemented": "implement", "implementing": "implement",
+    "deployed": "deploy", "deploying": "deploy", "deploys": "deploy",
+    "led": "lead", "leading": "lead", "leads": "lead",
+    "worked": "work", "working": "work", "works": "work",
+    "used": "use", "using": "use", "uses": "use",
+    "improved": "improve", "improving": "improve", "improves": "improve",
+    "reduced": "reduce", "reducing": "reduce", "reduces": "reduce",
+    "optimized": "optimize", "optimizing": "optimize", "optimizes": "optimize",
+    "automated": "automate", "automating": "automate", "automates": "automate",
+    "integrated": "integrate", "integrating": "integrate",
+    "collaborated": "collaborate", "collaborating": "collaborate",
+    "delivered": "deliver", "delivering": "deliver", "delivers": "deliver",
+    "maintained": "maintain", "maintaining": "maintain", "maintains": "maintain",
+    "analyzed": "analyze", "analyzing": "analyze", "analyzes": "analyze",
+    "tested": "test", "testing": "testing", "tests": "test",
+    "wrote": "write", "written": "write", "writing": "writing",
+    "ran": "run", "running": "run", "runs": "run",
+    "made": "make", "making": "make", "makes": "make",
+    "taught": "teach", "teaching": "teach",
+    "programming": "programming", "engineering": "engineering",
+    "learning": "learning", "processing": "processing",
+    "children": "child", "people": "people", "data": "datum",
+    "analyses": "analysis", "bases": "base",
+}
+
+_PLURAL_KEEP = ("ss", "us", "is", "ics", "ous", "sis")
+
+
+@lru_cache(maxsize=1)
+def _lookup_table():
+    """English lemma lookup table (optional dependency) merged with LEMMA_TABLE"""
+    table = {}
+
+    if LOOKUPS_ENABLED:
+        try:
+            # Registered as .json but shipped gzipped
+            path = str(spacy_lookups_data.en["lemma_lookup"])
+            if not path.endswith(".gz"):
+                path += ".gz"
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                table = json.load(f)
+        except (AttributeError, KeyError, OSError, ValueError):
+            table = {}
+
+    table.update(LEMMA_TABLE)
+    return table
+
+
+@lru_cache(maxsize=65536)
+def lemmatize(word):
+    """Lookup-table lemma for a lower-case word (plural rule as fallback)"""
+    lemma = _lookup_table().get(word)
+    if lemma is not None:
+        return lemma.lower()
+
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(_PLURAL_KEEP):
+        return word[:-1]
+
+    return word
@@ -1,22 +1,30 @@
+import hashlib
+import json
+import os
 import re
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import Counter
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, CountVectorizer
+from collections import Counter, deque
+from heapq import heappush, heappushpop, nlargest
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-from utils.pdf_parser import extract_text
-from utils.text_cleaner import clean_text
+from utils.pdf_parser import extract_text, NamedBytesIO, read_file_bytes, set_pdf_backend
+import utils.pdf_parser as pdf_parser
+from utils.text_cleaner import (
+    clean_text, iter_analyze_texts, cleaner_version, set_cleaner_backend
+)
+import utils.text_cleaner as text_cleaner
+from utils.nlp import get_nlp, pipes_except, NER_COMPONENTS
+from utils.archive import UnreadableResume
+from utils.resume_cache import ResumeCache, content_hash, DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
 
 # ===============================
-# NLP - FIXED LOADING
+# NLP
 # ===============================
-import spacy
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("⚠️ spaCy model not found. Name extraction will use fallback methods.")
-    nlp = None
+# The spaCy model is shared with text_cleaner and loaded lazily by
+# utils.nlp; here it only runs NER, and only for the name fallback
 
 
 
@@ -809,15 +817,30 @@ LOCATION_KEYWORDS = {
     'university', 'institute', 'school', 'Pradesh'
 }
 
-def extract_candidate_name(text, metadata=None):
+def extract_candidate_name(text, metadata=None, person_entities=None):
     """
     Extract name using FONT SIZE (largest text is usually the name)
     Falls back to other methods if font data unavailable
+    person_entities: PERSON entities already found by analyze_texts;
+    if None, NER runs here - and only if the first two strategies fail
     """
+    name = extract_name_without_ner(text, metadata)
+    if name:
+        return name
+
+    # STRATEGY 3: NER with spaCy (SAFE GUARD) - Only if model is loaded
+    if person_entities is None:
+        person_entities = find_person_entities(text)
+
+    return name_from_entities(person_entities) or "Unknown Candidate"
+
+
+def extract_name_without_ner(text, metadata=None):
+    """Font and regex strategies only (no spaCy). Returns None if both fail"""
     
     # STRATEGY 1: FONT-BASED EXTRACTION (MOST RELIABLE)
-    if metadata and 'font_data' in metadata:
-        name = extract_name_by_font(metadata['font_data'], text)
+    if metadata and 'font_sizes' in metadata:
+        name = extract_name_by_font(metadata['font_text'], metadata['font_sizes'])
         if name and name != "Unknown Candidate":
             return name
     
@@ -855,73 +878,77 @@ def extract_candidate_name(text, metadata=None):
                 if not any(w.lower() in common_words for w in words):
                     return line.title()
     
-    # STRATEGY 3: NER with spaCy (SAFE GUARD) - Only if model is loaded
-    if nlp:
-        try:
-            doc = nlp(text[:3000])
+    return None
 
-            for ent in doc.ents:
-                if ent.label_ == "PERSON":
-                    low = ent.text.lower()
 
-                    if any(loc in low for loc in LOCATION_KEYWORDS):
-                        continue
+def find_person_entities(text):
+    """Run spaCy NER alone over the top of the resume"""
+    nlp = get_nlp()
+    if not nlp:
+        return []
 
-                    if any(header in low for header in INVALID_HEADERS):
-                        continue
+    try:
+        doc = nlp(text[:3000], disable=pipes_except(nlp, NER_COMPONENTS))
+        return [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+    except Exception as e:
+        print(f"spaCy NER failed: {e}")
+        return []
 
-                    words = ent.text.split()
-                    if 2 <= len(words) <= 4 and not re.search(r'\d', ent.text):
-                        if all(
-                            w[0].isupper() and w[1:].islower()
-                            for w in words if len(w) > 1
-                        ):
-                            return ent.text.title()
-        except Exception as e:
-            print(f"spaCy NER failed: {e}")
-    
-    return "Unknown Candidate"
 
+def name_from_entities(person_entities):
+    """First PERSON entity that looks like a real name, or None"""
+    for entity in person_entities:
+        low = entity.lower()
+
+        if any(loc in low for loc in LOCATION_KEYWORDS):
+            continue
+
+        if any(header in low for header in INVALID_HEADERS):
+            continue
+
+        words = entity.split()
+        if 2 <= len(words) <= 4 and not re.search(r'\d', entity):
+            if all(
+                w[0].isupper() and w[1:].islower()
+                for w in words if len(w) > 1
+            ):
+                return entity.title()
+
+    return None
 
-def extract_name_by_font(font_data, text):
+
+def extract_name_by_font(font_text, font_sizes):
     """
     Extract name by finding text with LARGEST font size
     This is the most reliable method - names are typically in largest font
+    font_text / font_sizes: page-1 characters and one size per character
     """
-    if not font_data:
+    if not font_text or len(font_text) != len(font_sizes):
         return None
-    
-    # Group text by font size
+
+    # Runs of equal size in one vectorized pass; only run boundaries
+    # are visited below, never single characters
+    sizes = np.asarray(font_sizes, dtype=np.float64)
+    run_starts = (np.flatnonzero(np.diff(sizes)) + 1).tolist()
+
+    # Group text by font size: a group continues while sizes stay within
+    # 0.5 of the size it started with
     font_groups = {}
-    current_text = ""
-    current_size = None
-    
-    for char_info in font_data:
-        char = char_info.get('text', '')
-        size = round(char_info.get('size', 0), 1)
-        
-        if current_size is None:
-            current_size = size
-        
-        # If same size, accumulate
-        if abs(size - current_size) < 0.5:
-            current_text += char
-        else:
-            # New size - save previous group
-            if current_text.strip():
-                if current_size not in font_groups:
-                    font_groups[current_size] = []
-                font_groups[current_size].append(current_text.strip())
-            
-            current_text = char
-            current_size = size
-    
-    # Save last group
-    if current_text.strip():
-        if current_size not in font_groups:
-            font_groups[current_size] = []
-        font_groups[current_size].append(current_text.strip())
-    
+    group_start = 0
+    current_size = round(float(sizes[0]), 1)
+
+    for start in run_starts + [len(sizes)]:
+        size = round(float(sizes[start]), 1) if start < len(sizes) else None
+        if size is not None and abs(size - current_size) < 0.5:
+            continue
+
+        chunk = font_text[group_start:start].strip()
+        if chunk:
+            font_groups.setdefault(current_size, []).append(chunk)
+
+        group_start = start
+        current_size = size
+
     # Find largest font size
     if not font_groups:
         return None
@@ -982,42 +1009,548 @@ def is_valid_name(name):
     return True
 
 
+# ===============================
+# COMPILED SKILL MATCHER
+# ===============================
+# Flattened skill -> weight view of the ontology (later domains win on duplicates)
+SKILL_WEIGHTS = {}
+for _domain in SKILL_ONTOLOGY.values():
+    SKILL_WEIGHTS.update(_domain)
+
+
+def _is_word_char(ch):
+    return bool(re.match(r'\w', ch))
+
+
+def _trie_to_regex(node):
+    """
+    Render a character trie as a nested regex.
+    Longer branches come before the terminal so the longest term wins.
+    """
+    branches = [
+        re.escape(ch) + _trie_to_regex(child)
+        for ch, child in sorted(node.items()) if ch
+    ]
+    if '' in node:
+        branches.append(r'\b')
+
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+@lru_cache(maxsize=1)
+def _skill_matcher():
+    """
+    Build (once) a single regex that finds every ontology term in one scan.
+    Returns (pattern, prefixes) where prefixes maps a term to the shorter
+    terms that also match whenever it matches (e.g. "react.js" -> "react").
+    Call _skill_matcher.cache_clear() after editing SKILL_ONTOLOGY at runtime.
+    """
+    terms = list(SKILL_WEIGHTS)
+
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    # Same rules as r'\b' + re.escape(skill) + r'\b', but evaluated at every
+    # position through a zero-width lookahead so overlapping terms are kept
+    pattern = re.compile(r'\b(?=(' + _trie_to_regex(trie) + '))')
+
+    # A shorter term nested at the start of a longer match only counts if its
+    # own trailing word boundary holds, which depends only on the next char
+    prefixes = {}
+    for term in terms:
+        prefixes[term] = [
+            other for other in terms
+            if len(other) < len(term)
+            and term.startswith(other)
+            and _is_word_char(other[-1]) != _is_word_char(term[len(other)])
+        ]
+
+    return pattern, prefixes
+
+
+def find_ontology_skills(text):
+    """Return the set of ontology skills mentioned in text"""
+    if not text:
+        return set()
+
+    pattern, prefixes = _skill_matcher()
+    found = set()
+
+    for match in pattern.finditer(text.lower()):
+        term = match.group(1)
+        found.add(term)
+        found.update(prefixes[term])
+
+    return found
+
+
 # ===============================
 # SKILL EXTRACTION
 # ===============================
 def extract_jd_skills(job_desc):
     """Extract skills from job description"""
-    text = job_desc.lower()
-    jd_skills = {}
-
-    for domain in SKILL_ONTOLOGY.values():
-        for skill, weight in domain.items():
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text):
-                jd_skills[skill] = weight
+    found = find_ontology_skills(job_desc)
 
-    return jd_skills
+    return {
+        skill: weight
+        for skill, weight in SKILL_WEIGHTS.items()
+        if skill in found
+    }
 
 
-def extract_resume_skills(resume_text, jd_skills):
-    """Extract matching skills from resume"""
-    text = resume_text.lower()
-    found = {}
+def extract_resume_skills(resume_text, jd_skills, found=None):
+    """
+    Extract matching skills from resume
+    found: ontology skills already detected in resume_text (skips the scan)
+    """
+    if found is None:
+        found = find_ontology_skills(resume_text)
+    text = None
+    matched = {}
 
     for skill, weight in jd_skills.items():
+        if skill in SKILL_WEIGHTS:
+            if skill in found:
+                matched[skill] = weight
+            continue
+
+        # Custom (non-ontology) skill: fall back to a direct search
+        if text is None:
+            text = resume_text.lower()
         pattern = r'\b' + re.escape(skill) + r'\b'
         if re.search(pattern, text):
-            found[skill] = weight
+            matched[skill] = weight
 
-    return found
+    return matched
+
+
+# ===============================
+# SEMANTIC SIMILARITY (BATCH TF-IDF)
+# ===============================
+def compute_semantic_similarities(resume_texts, job_desc_clean):
+    """
+    Fit ONE TF-IDF vectorizer over all cleaned resumes plus the JD and
+    return the cosine similarity (0-1) of every resume to the JD.
+    The IDF is learned from the whole batch, so it actually down-weights
+    terms every candidate shares.
+    """
+    return compute_similarity_matrix(resume_texts, [job_desc_clean])[:, 0].tolist()
+
+
+def compute_similarity_matrix(resume_texts, jd_texts):
+    """
+    Same as compute_semantic_similarities for several cleaned JDs at once:
+    one vectorizer over resumes + JDs, returns an N x M array of cosines.
+    """
+    resume_texts = list(resume_texts)
+    jd_texts = list(jd_texts)
+    n_resumes = len(resume_texts)
+
+    if not resume_texts or not jd_texts:
+        return np.zeros((n_resumes, len(jd_texts)))
+
+    try:
+        tfidf = TfidfVectorizer(ngram_range=(1, 2))
+        matrix = tfidf.fit_transform(resume_texts + jd_texts)
+    except ValueError:
+        # Empty vocabulary (e.g. every document cleaned down to nothing)
+        return np.zeros((n_resumes, len(jd_texts)))
+
+    # Rows are L2-normalized, so one sparse matrix product gives the
+    # cosine similarity of every resume against every JD row
+    similarities = (matrix[:n_resumes] @ matrix[n_resumes:].T).toarray()
+
+    return np.clip(similarities, 0.0, 1.0)
+
+
+# ===============================
+# SCORING
+# ===============================
+CRITICAL_SKILLS = {'react', 'reactjs', 'javascript', 'js', 'html', 'css', 'python', 'java'}
+
+
+def build_skill_matrix(candidates, jd_skills):
+    """
+    Sparse boolean candidate x JD-skill matrix plus the JD weight vector.
+    Returns (matrix, weights, skills) where skills names the columns.
+    """
+    skills = list(jd_skills)
+    column = {skill: j for j, skill in enumerate(skills)}
+    weights = np.array([jd_skills[skill] for skill in skills], dtype=float)
+
+    # JD skills outside the ontology are not in candidate["skills"]
+    custom = {skill: jd_skills[skill] for skill in skills if skill not in SKILL_WEIGHTS}
+
+    rows, cols = [], []
+    for i, candidate in enumerate(candidates):
+        for skill in candidate["skills"]:
+            j = column.get(skill)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+
+        if custom:
+            for skill in extract_resume_skills(candidate["raw_text"], custom, found=set()):
+                rows.append(i)
+                cols.append(column[skill])
+
+    matrix = csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, cols)),
+        shape=(len(candidates), len(skills))
+    )
+    matrix.sort_indices()
+
+    return matrix, weights, skills
+
+
+def score_matrix(matrix, weights, skills, similarities):
+    """
+    Score every candidate at once from the skill matrix:
+    50% weighted coverage + 30% skill count + 20% semantic similarity,
+    plus the critical-skill bonus. Returns an array of final scores (0-100).
+    """
+    scores = score_skill_matrix(
+        matrix,
+        weights[:, None],
+        np.ones((len(skills), 1)),
+        skill_critical_mask(skills),
+        np.asarray(similarities, dtype=float)[:, None]
+    )
+    return scores[:, 0]
+
+
+def skill_critical_mask(skills):
+    """1.0 for columns that are CRITICAL_SKILLS, else 0.0"""
+    return np.array([skill in CRITICAL_SKILLS for skill in skills], dtype=float)
+
+
+def score_skill_matrix(matrix, weight_matrix, presence, critical, similarity_matrix):
+    """
+    N x M scores for N candidates against M job descriptions.
+    matrix:            N x U candidate x skill (sparse, boolean)
+    weight_matrix:     U x M skill weight in each JD (0 if absent)
+    presence:          U x M 1.0 where the skill belongs to the JD
+    critical:          U critical-skill mask
+    similarity_matrix: N x M TF-IDF cosines
+    """
+    n_candidates = matrix.shape[0]
+    matched = matrix.astype(np.float64)
+
+    total_weight = weight_matrix.sum(axis=0)
+    n_skills = presence.sum(axis=0)
+
+    matched_weight = np.asarray(matched @ weight_matrix).reshape(n_candidates, -1)
+    matched_count = np.asarray(matched @ presence).reshape(n_candidates, -1)
+    critical_matched = np.asarray(matched @ (presence * critical[:, None])).reshape(n_candidates, -1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skill_coverage = np.where(total_weight > 0, matched_weight / total_weight, 0.0)
+        skill_count_score = np.where(n_skills > 0, matched_count / n_skills, 0.0)
+
+    base_score = (
+        0.50 * skill_coverage +
+        0.30 * skill_count_score +
+        0.20 * similarity_matrix
+    )
+
+    critical_bonus = (critical_matched / 4) * 0.15
+
+    return np.round(np.minimum((base_score + critical_bonus) * 100, 100), 2)
+
+
+def rank_candidates(scores):
+    """Row indices by descending score; ties keep input order"""
+    return np.argsort(-np.asarray(scores), kind="stable")
+
+
+def result_row(candidate, score, matrix, row, skills):
+    """Decode one candidate's matched / missing skills into a result row"""
+    matched_cols = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+    matched_skills = {skills[j] for j in matched_cols}
+    missing_skills = set(skills) - matched_skills
+
+    return {
+        "Candidate": candidate["name"],
+        "Email": candidate["email"],
+        "Phone": candidate["phone"],
+        "Matching Percentage": float(score),
+        "Matched Skills": ", ".join(sorted(matched_skills)) or "—",
+        "Missing Skills": ", ".join(sorted(missing_skills)) or "—",
+        "File": candidate.get("file", "")
+    }
+
+
+# ===============================
+# RESUME PARSING
+# ===============================
+# Bump whenever name / contact / skill extraction output changes
+ARTIFACT_VERSION = "4"
+
+
+def artifact_version():
+    """Version stamp for cached artifacts: extractor + PDF backend + cleaner + ontology"""
+    ontology = json.dumps(SKILL_WEIGHTS, sort_keys=True)
+    stamp = f"{ARTIFACT_VERSION}|{pdf_parser.PDF_BACKEND}|{cleaner_version()}|{ontology}"
+    return hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:16]
+
+
+def open_resume_cache(path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """Open the on-disk resume cache stamped with the current artifact version"""
+    return ResumeCache(path, version=artifact_version(), max_bytes=max_bytes)
+
+
+def extract_resume_text(file):
+    """extract_text wrapper that always returns (raw_text, metadata)"""
+    # Extract text + metadata (including font info)
+    extraction_result = extract_text(file)
+
+    # Handle tuple unpacking
+    if isinstance(extraction_result, tuple):
+        return extraction_result
+
+    return extraction_result, {}
+
+
+def build_candidate(raw_text, name, cleaned, person_entities):
+    """Assemble the per-candidate dict once cleaning / NER are done"""
+    if name is None:
+        name = name_from_entities(person_entities) or "Unknown Candidate"
+
+    return {
+        "raw_text": raw_text,
+        "clean_text": cleaned,
+        "name": name,
+        "email": extract_email(raw_text),
+        "phone": extract_phone(raw_text),
+        # Every ontology skill present, not just the current JD's
+        "skills": sorted(find_ontology_skills(raw_text)),
+    }
+
+
+def iter_parse_resumes(resume_files, cache=None, batch_size=50, n_process=1):
+    """
+    Parse a stream of resume files with ONE batched spaCy pass
+    (nlp.pipe over every file, batch_size docs at a time, optionally
+    spread over n_process spaCy processes).
+    Yields (file_name, candidate, error) in input order; exactly one of
+    candidate / error is set. Cache hits and failures skip spaCy work.
+    candidate["file"] is the name of the file it was parsed from (it is
+    not part of the cached artifact). A file with no extractable text is
+    an error, not an empty candidate.
+    """
+    def items():
+        for file in resume_files:
+            context = {"file": getattr(file, "name", "?"), "key": None,
+                       "cached": None, "raw_text": None, "name": None, "error": None}
+            try:
+                if isinstance(file, UnreadableResume):
+                    file.raise_error()
+
+                if cache is not None:
+                    name, data = read_file_bytes(file)
+                    context["key"] = content_hash(data)
+                    context["cached"] = cache.get(context["key"])
+                    if context["cached"] is not None:
+                        yield "", False, context
+                        continue
+                    file = NamedBytesIO(data, name)
+
+                raw_text, metadata = extract_resume_text(file)
+                if not raw_text or not raw_text.strip():
+                    raise ValueError("no text could be extracted")
+                context["raw_text"] = raw_text
+                # Use font-based name extraction; NER only if it (and regex) fail
+                context["name"] = extract_name_without_ner(raw_text, metadata)
+                yield raw_text, context["name"] is None, context
+
+            except Exception as e:
+                context["error"] = str(e)
+                yield "", False, context
+
+    for cleaned, person_entities, context in iter_analyze_texts(items(), batch_size, n_process):
+        if context["error"]:
+            yield context["file"], None, context["error"]
+            continue
+
+        if context["cached"] is not None:
+            yield context["file"], {**context["cached"], "file": context["file"]}, None
+            continue
+
+        try:
+            candidate = build_candidate(
+                context["raw_text"], context["name"], cleaned, person_entities
+            )
+        except Exception as e:
+            yield context["file"], None, str(e)
+            continue
+
+        if cache is not None:
+            cache.put(context["key"], candidate)
+
+        candidate["file"] = context["file"]
+        yield context["file"], candidate, None
+
+
+def parse_resumes(resume_files, cache=None, batch_size=50, n_process=1):
+    """Parse resumes in-process (batched spaCy), skipping files that fail"""
+    return _collect_candidates(iter_parse_resumes(resume_files, cache, batch_size, n_process))
+
+
+# ===============================
+# PARALLEL PARSING (PROCESS POOL)
+# ===============================
+# Files per worker task - each task runs one batched spaCy pass
+TASK_CHUNK_SIZE = 8
+
+
+def _init_worker(backend, pdf_backend):
+    """Runs once per worker process: same backends, spaCy model loaded up front"""
+    set_pdf_backend(pdf_backend)
+    set_cleaner_backend(backend)
+    if backend == "spacy":
+        get_nlp()
+
+
+def _parse_resume_chunk(chunk):
+    """Worker task: chunk of (name, bytes) -> [(name, candidate, error)]"""
+    try:
+        files = [NamedBytesIO(data, name) for name, data in chunk]
+        return list(iter_parse_resumes(files, batch_size=len(files)))
+    except Exception as e:
+        # Never raise, so one bad chunk can't break the pool
+        return [(name, None, str(e)) for name, _ in chunk]
+
+
+def iter_parse_resumes_parallel(resume_files, workers=None, cache=None):
+    """
+    Parse resumes in a process pool (PDF parsing and spaCy are CPU-bound).
+    Yields (file_name, candidate, error) in input order, like
+    iter_parse_resumes. At most a few chunks per worker are held in memory
+    at once. Cache lookups and writes stay in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+
+    pending = deque()  # ("ready", name, candidate, error) or ("task", keys, future)
+    chunk, keys = [], []
+
+    def collect(job):
+        if job[0] == "ready":
+            return [job[1:]]
+
+        _, task_keys, future = job
+        try:
+            parsed = future.result()
+        except Exception as e:
+            parsed = [(name, None, str(e)) for name, _ in task_keys]
+
+        for (_, key), (name, candidate, error) in zip(task_keys, parsed):
+            if not error and cache is not None:
+                cache.put(key, {k: v for k, v in candidate.items() if k != "file"})
+
+        return parsed
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(text_cleaner.CLEANER_BACKEND, pdf_parser.PDF_BACKEND)
+    ) as pool:
+
+        def submit():
+            pending.append(("task", list(keys), pool.submit(_parse_resume_chunk, list(chunk))))
+            chunk.clear()
+            keys.clear()
+
+        for file in resume_files:
+            try:
+                name, data = read_file_bytes(file)
+            except Exception as e:
+                pending.append(("ready", getattr(file, "name", "?"), None, f"read failed: {e}"))
+                continue
+
+            key = None
+            if cache is not None:
+                key = content_hash(data)
+                cached = cache.get(key)
+                if cached is not None:
+                    # Flush the partial chunk first so order is preserved
+                    if chunk:
+                        submit()
+                    pending.append(("ready", name, {**cached, "file": name}, None))
+                    continue
+
+            chunk.append((name, data))
+            keys.append((name, key))
+            if len(chunk) >= TASK_CHUNK_SIZE:
+                submit()
+
+            # Collect in submission order to keep results deterministic
+            while len(pending) >= max_pending:
+                yield from collect(pending.popleft())
+
+        if chunk:
+            submit()
+
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def parse_resumes_parallel(resume_files, workers=None, cache=None):
+    """Process-pool parse_resumes: input order kept, failed files skipped"""
+    return _collect_candidates(iter_parse_resumes_parallel(resume_files, workers, cache))
+
+
+def _collect_candidates(parsed):
+    """List of candidates from (file_name, candidate, error), logging errors"""
+    candidates = []
+
+    for name, candidate, error in parsed:
+        if error:
+            print(f"Error processing {name}: {error}")
+            continue
+        candidates.append(candidate)
+
+    return candidates
 
 
 # ===============================
 # MAIN ANALYZER
 # ===============================
-def analyze_resumes(resume_files, job_desc):
+def iter_parse_candidates(resume_files, workers=1, cache=None, batch_size=50, n_process=1):
+    """Yield (file_name, candidate, error) in-process (workers=1) or from a pool"""
+    if workers == 1:
+        return iter_parse_resumes(resume_files, cache, batch_size, n_process)
+    return iter_parse_resumes_parallel(resume_files, workers, cache)
+
+
+def parse_candidates(resume_files, workers=1, cache=None, batch_size=50, n_process=1):
+    """Parse resumes in-process (workers=1) or in a process pool"""
+    return _collect_candidates(
+        iter_parse_candidates(resume_files, workers, cache, batch_size, n_process)
+    )
+
+
+def analyze_resumes(resume_files, job_desc, workers=1, cache=None,
+                    batch_size=50, n_process=1, limit=None, min_score=None):
     """
     Analyze resumes with font-based name extraction
+    workers:    1 parses in-process, N > 1 uses a pool of N processes,
+                None uses one process per CPU core
+    cache:      optional ResumeCache (see open_resume_cache) - known files
+                skip parsing and only pay for scoring
+    batch_size: docs per spaCy nlp.pipe batch (in-process mode)
+    n_process:  spaCy processes for cleaning (in-process mode only)
+    limit:      return only the top `limit` candidates (None = all)
+    min_score:  return only candidates scoring at least this (None = all)
+    One-shot runs fit TF-IDF once over every resume either way (the IDF
+    needs the whole pool), so limit / min_score only save the sort here;
+    bound pruning pays off when re-ranking a built ResumePool.
     """
     if not resume_files or not job_desc.strip():
         return []
@@ -1025,75 +1558,397 @@ def analyze_resumes(resume_files, job_desc):
     jd_skills = extract_jd_skills(job_desc)
     job_desc_clean = clean_text(job_desc)
 
-    results = []
+    candidates = parse_candidates(resume_files, workers, cache, batch_size, n_process)
+
+    return rank_parsed_candidates(candidates, jd_skills, job_desc_clean, limit, min_score)
+
+
+def rank_parsed_candidates(candidates, jd_skills, job_desc_clean, limit=None, min_score=None):
+    """Score and rank already parsed candidates against one JD"""
+    # One vectorizer for the whole batch instead of one per resume
+    similarities = compute_semantic_similarities(
+        [c["clean_text"] for c in candidates], job_desc_clean
+    )
+
+    # All scores for the batch from one candidate x skill matrix
+    matrix, weights, skills = build_skill_matrix(candidates, jd_skills)
+    scores = score_matrix(matrix, weights, skills, similarities)
+
+    # Stable ranking: ties keep upload order, in serial and parallel mode alike.
+    # Skill lists are only decoded for the rows actually returned
+    order = select_ranked(scores, np.arange(len(scores)), limit, min_score)
+
+    return [
+        result_row(candidates[i], scores[i], matrix, i, skills)
+        for i in order
+    ]
+
+
+# ===============================
+# STREAMING ANALYZER
+# ===============================
+# Stateless TF cosine (no IDF) for provisional scores while files stream in
+_PROVISIONAL_VECTORIZER = HashingVectorizer(
+    ngram_range=(1, 2), alternate_sign=False, norm="l2"
+)
+
+
+def provisional_similarity(clean_resume, jd_vector):
+    """Cosine of one cleaned resume against the hashed JD vector"""
+    vector = _PROVISIONAL_VECTORIZER.transform([clean_resume])
+    return float((vector @ jd_vector.T).toarray()[0, 0])
+
+
+def iter_analyze_resumes(resume_files, job_desc, workers=1, cache=None,
+                         batch_size=1, n_process=1, limit=None, top_k=10):
+    """
+    Streaming analyze_resumes: yields an event as soon as each file is done
+      {"type": "candidate", "done", "total", "file", "result", "top", "top_changed"}
+      {"type": "error",     "done", "total", "file", "error",  "top", "top_changed"}
+    and finally
+      {"type": "final", "results": [...]}  (exactly what analyze_resumes returns)
+    Per-file scores are provisional (semantic term is a TF cosine until the
+    batch TF-IDF is fitted); "top" is the running top_k of those rows.
+    The final event also carries "candidates" (the parsed pool, e.g. for
+    ResumePool). total is None when resume_files has no len().
+    batch_size defaults to 1: nlp.pipe reads a whole batch of files before
+    its tagger returns the first doc, so larger batches delay every event.
+    """
+    if not resume_files or not job_desc.strip():
+        yield {"type": "final", "results": [], "candidates": []}
+        return
+
+    total = len(resume_files) if hasattr(resume_files, "__len__") else None
+
+    jd_skills = extract_jd_skills(job_desc)
+    job_desc_clean = clean_text(job_desc)
+    jd_vector = _PROVISIONAL_VECTORIZER.transform([job_desc_clean])
+
+    candidates = []
+    heap = []  # min-heap of (score, -index, row): earlier uploads win ties
+    top = []
+    done = 0
+
+    parsed = iter_parse_candidates(resume_files, workers, cache, batch_size, n_process)
+
+    for name, candidate, error in parsed:
+        done += 1
+
+        if error:
+            print(f"Error processing {name}: {error}")
+            yield {"type": "error", "done": done, "total": total, "file": name,
+                   "error": error, "top": top, "top_changed": False}
+            continue
+
+        index = len(candidates)
+        candidates.append(candidate)
+
+        similarity = provisional_similarity(candidate["clean_text"], jd_vector)
+        matrix, weights, skills = build_skill_matrix([candidate], jd_skills)
+        score = score_matrix(matrix, weights, skills, [similarity])[0]
+        row = result_row(candidate, score, matrix, 0, skills)
+
+        entry = (row["Matching Percentage"], -index, row)
+        top_changed = True
+        if len(heap) < top_k:
+            heappush(heap, entry)
+        elif entry > heap[0]:
+            heappushpop(heap, entry)
+        else:
+            top_changed = False
+
+        if top_changed:
+            top = [item[2] for item in sorted(heap, reverse=True)]
+
+        yield {"type": "candidate", "done": done, "total": total, "file": name,
+               "result": row, "top": top, "top_changed": top_changed}
+
+    yield {
+        "type": "final",
+        "results": rank_parsed_candidates(candidates, jd_skills, job_desc_clean, limit),
+        "candidates": candidates
+    }
+
+
+# ===============================
+# MULTI-JD ANALYZER
+# ===============================
+def analyze_resumes_multi(resume_files, job_descs, workers=1, cache=None,
+                          batch_size=50, n_process=1, limit=None, min_score=None):
+    """
+    Rank ONE resume pool against MANY job descriptions.
+    job_descs: {jd_name: jd_text}
+    Every resume is parsed once, skills are matched against the union of
+    all JD skill sets, and all scores come from one N x M matrix (skill
+    weights and TF-IDF cosine, with each JD's own IDF). Other arguments
+    as in analyze_resumes.
+    Returns {jd_name: ranked result rows, as analyze_resumes returns}
+    """
+    job_descs = {name: text for name, text in job_descs.items() if text and text.strip()}
+    if not resume_files or not job_descs:
+        return {name: [] for name in job_descs}
+
+    candidates = parse_candidates(resume_files, workers, cache, batch_size, n_process)
+
+    return rank_parsed_candidates_multi(candidates, job_descs, limit, min_score)
+
+
+def rank_parsed_candidates_multi(candidates, job_descs, limit=None, min_score=None):
+    """
+    Score and rank already parsed candidates against several JDs
+    ({jd_name: jd_text}), as analyze_resumes_multi. Term counts are shared;
+    every JD scores exactly as it would alone in analyze_resumes.
+    """
+    job_descs = {name: text for name, text in job_descs.items() if text and text.strip()}
+    if not candidates or not job_descs:
+        return {name: [] for name in job_descs}
+
+    jd_names = list(job_descs)
+    jd_skill_sets = [extract_jd_skills(job_descs[name]) for name in jd_names]
+
+    # Union of every JD's skills -> one candidate x skill matrix
+    union_skills = {}
+    for jd_skills in jd_skill_sets:
+        for skill, weight in jd_skills.items():
+            union_skills.setdefault(skill, weight)
+
+    matrix, _, skills = build_skill_matrix(candidates, union_skills)
+
+    weight_matrix = np.zeros((len(skills), len(jd_names)))
+    presence = np.zeros((len(skills), len(jd_names)))
+    for j, jd_skills in enumerate(jd_skill_sets):
+        for u, skill in enumerate(skills):
+            if skill in jd_skills:
+                weight_matrix[u, j] = jd_skills[skill]
+                presence[u, j] = 1.0
+
+    # One count matrix, but each JD's column gets its own IDF (see PoolSimilarity)
+    pool_similarity = PoolSimilarity([c["clean_text"] for c in candidates])
+    similarity_matrix = np.column_stack([
+        pool_similarity.similarities(clean_text(job_descs[name])) for name in jd_names
+    ])
+
+    scores = score_skill_matrix(
+        matrix, weight_matrix, presence, skill_critical_mask(skills), similarity_matrix
+    )
+
+    rankings = {}
+    for j, name in enumerate(jd_names):
+        # Decode against this JD's columns only
+        columns = np.flatnonzero(presence[:, j])
+        jd_matrix = matrix[:, columns].tocsr()
+        jd_matrix.sort_indices()
+        jd_skills = [skills[u] for u in columns]
+
+        order = select_ranked(scores[:, j], np.arange(len(candidates)), limit, min_score)
+
+        rankings[name] = [
+            result_row(candidates[i], scores[i, j], jd_matrix, i, jd_skills)
+            for i in order
+        ]
+
+    return rankings
+
+
+# ===============================
+# INCREMENTAL RE-SCORING (JD EDITS)
+# ===============================
+class PoolSimilarity:
+    """
+    TF-IDF cosine of a fixed set of cleaned resumes to any cleaned JD,
+    from term counts fitted once. Each JD is scored with the IDF of the
+    resumes plus that JD alone (N + 1 documents), exactly as
+    compute_semantic_similarities refits it, so a JD's scores never
+    depend on which other JDs are ranked alongside it.
+    """
+
+    def __init__(self, resume_texts):
+        resume_texts = list(resume_texts)
+        self.n_resumes = len(resume_texts)
+
+        # Term counts with TfidfVectorizer's defaults (no IDF yet)
+        counter = CountVectorizer(ngram_range=(1, 2))
+        self.analyzer = counter.build_analyzer()
 
-    for file in resume_files:
         try:
-            # Extract text + metadata (including font info)
-            extraction_result = extract_text(file)
-            
-            # Handle tuple unpacking
-            if isinstance(extraction_result, tuple):
-                raw_text, metadata = extraction_result
-            else:
-                raw_text = extraction_result
-                metadata = {}
-            
-            clean_resume = clean_text(raw_text)
-
-            # Use font-based name extraction
-            name = extract_candidate_name(raw_text, metadata)
-            email = extract_email(raw_text)
-            phone = extract_phone(raw_text)
-
-            resume_skills = extract_resume_skills(raw_text, jd_skills)
-
-            matched_skills = set(resume_skills.keys())
-            missing_skills = set(jd_skills.keys()) - matched_skills
-
-            # SCORING
-            total_weight = sum(jd_skills.values())
-            matched_weight = sum(resume_skills.values())
-
-            skill_coverage = matched_weight / total_weight if total_weight else 0
-            skill_count_score = len(matched_skills) / len(jd_skills) if jd_skills else 0
+            counts = counter.fit_transform(resume_texts)
+        except ValueError:
+            # Empty vocabulary: every resume cleaned down to nothing
+            self.vocabulary = {}
+            self.counts = None
+            return
 
-            try:
-                tfidf = TfidfVectorizer(ngram_range=(1, 2), max_features=500)
-                vectors = tfidf.fit_transform([clean_resume, job_desc_clean])
-                semantic_similarity = cosine_similarity(
-                    vectors[0:1], vectors[1:2]
-                )[0][0]
-            except:
-                semantic_similarity = 0.0
-
-            base_score = (
-                0.50 * skill_coverage +
-                0.30 * skill_count_score +
-                0.20 * semantic_similarity
-            )
-            
-            critical_skills = {'react', 'reactjs', 'javascript', 'js', 'html', 'css', 'python', 'java'}
-            critical_matched = len(matched_skills & critical_skills)
-            critical_bonus = (critical_matched / 4) * 0.15
-            
-            final_score = round(
-                min((base_score + critical_bonus) * 100, 100),
-                2
+        counts = counts.astype(np.float64)
+        self.vocabulary = counter.vocabulary_
+        self.counts = counts.tocsc()
+        self.doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+
+        # The fit always sees N resumes + 1 JD (smooth_idf: n + 1 = N + 2)
+        self.idf_numerator = self.n_resumes + 2
+        base_idf = np.log(self.idf_numerator / (1 + self.doc_freq)) + 1
+        self.base_idf = base_idf
+        self.sq_norms = np.asarray(counts.multiply(counts) @ (base_idf ** 2)).ravel()
+
+    def similarities(self, job_desc_clean, rows=None):
+        """TF-IDF cosine (0-1) to the cleaned JD for `rows` (default: every resume)"""
+        rows = np.arange(self.n_resumes) if rows is None else np.asarray(rows)
+        jd_counts = Counter(self.analyzer(job_desc_clean))
+
+        if self.counts is None or not jd_counts or not len(rows):
+            return np.zeros(len(rows))
+
+        columns, jd_tf, jd_sq_norm = [], [], 0.0
+        for term, count in jd_counts.items():
+            j = self.vocabulary.get(term)
+            if j is None:
+                # JD-only term: df = 1, only adds to the JD's own norm
+                idf = np.log(self.idf_numerator / 2) + 1
+                jd_sq_norm += (count * idf) ** 2
+                continue
+            columns.append(j)
+            jd_tf.append(count)
+
+        if not columns:
+            return np.zeros(len(rows))
+
+        columns = np.array(columns)
+        jd_idf = np.log(self.idf_numerator / (2 + self.doc_freq[columns])) + 1
+        jd_weights = np.array(jd_tf) * jd_idf
+        jd_sq_norm += float(jd_weights @ jd_weights)
+
+        # The JD raises df (lowers IDF) of its own terms: fix resume norms
+        counts = self.counts[:, columns]
+        if len(rows) < self.n_resumes:
+            counts = counts.tocsr()[rows]
+        delta = jd_idf ** 2 - self.base_idf[columns] ** 2
+        sq_norms = self.sq_norms[rows] + np.asarray(counts.multiply(counts) @ delta).ravel()
+        dots = np.asarray(counts @ (jd_idf * jd_weights)).ravel()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = np.where(
+                sq_norms > 0, dots / np.sqrt(sq_norms * jd_sq_norm), 0.0
             )
 
-            results.append({
-                "Candidate": name,
-                "Email": email,
-                "Phone": phone,
-                "Matching Percentage": final_score,
-                "Matched Skills": ", ".join(sorted(matched_skills)) or "—",
-                "Missing Skills": ", ".join(sorted(missing_skills)) or "—"
-            })
+        return np.clip(similarities, 0.0, 1.0)
 
-        except Exception as e:
-            print(f"Error processing {file.name}: {str(e)}")
-            continue
 
-    results.sort(key=lambda x: x["Matching Percentage"], reverse=True)
-    return results
\ No newline at end of file
+class ResumePool:
+    """
+    JD-independent artifacts of a parsed resume pool, built once:
+    - candidate x ontology-skill matrix
+    - term counts, document frequencies and squared TF-IDF norms
+      without the JD (PoolSimilarity)
+    rank(job_desc) then only runs extract_jd_skills and scoring. The
+    TF-IDF cosine is updated exactly for the JD's terms instead of
+    refitting the vectorizer, so results equal analyze_resumes.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        n_candidates = len(self.candidates)
+
+        # Candidate x ontology-skill matrix (CSC: JD columns are sliced out)
+        self.skill_column = {skill: j for j, skill in enumerate(SKILL_WEIGHTS)}
+        rows, cols = [], []
+        for i, candidate in enumerate(self.candidates):
+            for skill in candidate["skills"]:
+                j = self.skill_column.get(skill)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+
+        self.skill_matrix = csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)),
+            shape=(n_candidates, len(self.skill_column))
+        ).tocsc()
+
+        self.tfidf = PoolSimilarity([c["clean_text"] for c in self.candidates])
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def similarities(self, job_desc_clean, rows=None):
+        """TF-IDF cosine (0-1) to the cleaned JD for `rows` (default: every resume)"""
+        return self.tfidf.similarities(job_desc_clean, rows)
+
+    def rank(self, job_desc, limit=None, min_score=None):
+        """
+        Ranked result rows for one JD, as analyze_resumes returns.
+        limit:     keep only the best `limit` candidates (top-K mode)
+        min_score: drop candidates scoring below it (shortlist mode)
+        In either mode, candidates whose best possible score (similarity
+        = 1) cannot reach the K-th guaranteed score (similarity = 0) or
+        min_score never get a similarity computed. This saves time per JD
+        on a pool that is already built (the app's cached pool, a store);
+        building the pool itself still reads every resume.
+        """
+        if not self.candidates or not job_desc.strip():
+            return []
+
+        jd_skills = extract_jd_skills(job_desc)
+
+        skills = list(jd_skills)
+        weights = np.array([jd_skills[skill] for skill in skills], dtype=float)
+        matrix = self.skill_matrix[:, [self.skill_column[s] for s in skills]].tocsr()
+        matrix.sort_indices()
+
+        rows = candidate_bounds_filter(matrix, weights, skills, limit, min_score)
+        if not len(rows):
+            return []
+
+        scores = np.zeros(len(self.candidates))
+        scores[rows] = score_matrix(
+            matrix[rows], weights, skills, self.similarities(clean_text(job_desc), rows)
+        )
+
+        order = select_ranked(scores, rows, limit, min_score)
+
+        return [
+            result_row(self.candidates[i], scores[i], matrix, i, skills)
+            for i in order
+        ]
+
+
+def candidate_bounds_filter(matrix, weights, skills, limit=None, min_score=None):
+    """
+    Rows that can still reach the top `limit` / min_score, from the
+    skill part of the score alone: similarity adds at most 20 points, so
+    score(similarity=0) <= final score <= score(similarity=1).
+    """
+    n_candidates = matrix.shape[0]
+    rows = np.arange(n_candidates)
+
+    if limit is None and min_score is None:
+        return rows
+
+    lower = score_matrix(matrix, weights, skills, np.zeros(n_candidates))
+    upper = score_matrix(matrix, weights, skills, np.ones(n_candidates))
+    keep = np.ones(n_candidates, dtype=bool)
+
+    if limit is not None:
+        if limit <= 0:
+            return rows[:0]
+        if limit < n_candidates:
+            # K-th best guaranteed score; equal upper bounds may still tie in
+            kth_lower = np.partition(lower, n_candidates - limit)[n_candidates - limit]
+            keep &= upper >= kth_lower
+
+    if min_score is not None:
+        keep &= upper >= min_score
+
+    return rows[keep]
+
+
+def select_ranked(scores, rows, limit=None, min_score=None):
+    """
+    Indices from `rows` in rank order, dropping scores below min_score.
+    With a limit the best `limit` are heap-selected instead of sorting
+    everything; ties keep input order, as in rank_candidates.
+    """
+    if min_score is not None:
+        rows = rows[scores[rows] >= min_score]
+
+    if limit is None:
+        return rows[rank_candidates(scores[rows])]
+
+    return nlargest(limit, rows.tolist(), key=lambda i: (scores[i], -i))
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+# ===============================
+# SHARED SPACY MODEL (LAZY)
+# ===============================
+# One copy of the model per process, loaded on first use (not at import).
+# Callers pick the components they need per call:
+#   nlp(text, disable=pipes_except(nlp, CLEAN_COMPONENTS))
+MODEL_NAME = "en_core_web_sm"
+
+# Never used by this app - excluded at load time to save memory
+EXCLUDED_COMPONENTS = ["parser", "senter"]
+
+# Cleaning: tokenizer + POS tags + lemmas
+CLEAN_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer")
+
+# Name fallback: entity recognizer only (it has its own tok2vec in the sm model)
+NER_COMPONENTS = ("ner",)
+
+
+@lru_cache(maxsize=1)
+def get_nlp():
+    """Return the shared spaCy pipeline, or None if the model is missing"""
+    try:
+        import spacy
+        return spacy.load(MODEL_NAME, exclude=EXCLUDED_COMPONENTS)
+    except (ImportError, OSError):
+        print(f"⚠️ spaCy model not found. Run: python -m spacy download {MODEL_NAME}")
+        return None
+
+
+def pipes_except(nlp, components):
+    """Names of loaded pipes to disable so only `components` run"""
+    return [name for name in nlp.pipe_names if name not in components]
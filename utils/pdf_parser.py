@@ -1,20 +1,71 @@
 from docx import Document
 from PIL import Image
 import pdfplumber
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
+import glob
 import io
 import os
 import platform
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from array import array
+from contextlib import contextmanager, nullcontext
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor
 
 # ===============================
 # OPTIONAL OCR SUPPORT (CLOUD SAFE)
 # ===============================
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     OCR_ENABLED = True
 except ImportError:
     OCR_ENABLED = False
 
+# OCR tuning: pages are rasterized at the first DPI and only retried at the
+# next one when confidence or the meaningful-text check fails
+OCR_DPI_STEPS = (150, 300)
+OCR_MIN_CONFIDENCE = 60.0
+OCR_MAX_PAGES = int(os.getenv("RESUME_OCR_MAX_PAGES", "5"))
+OCR_WORKERS = int(os.getenv("RESUME_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Pages already run in parallel: while they do, each tesseract process is
+# kept single-threaded (see single_threaded_tesseract)
+_omp_lock = threading.Lock()
+_omp_users = 0
+_omp_saved = None
+
+@contextmanager
+def single_threaded_tesseract():
+    """
+    OMP_THREAD_LIMIT=1 for tesseract processes started inside the block.
+    Shared by concurrent callers and removed when the last one leaves;
+    a limit set by the user is left alone.
+    """
+    global _omp_users, _omp_saved
+
+    with _omp_lock:
+        if _omp_users == 0:
+            _omp_saved = os.environ.get("OMP_THREAD_LIMIT")
+            if _omp_saved is None:
+                os.environ["OMP_THREAD_LIMIT"] = "1"
+        _omp_users += 1
+
+    try:
+        yield
+    finally:
+        with _omp_lock:
+            _omp_users -= 1
+            if _omp_users == 0 and _omp_saved is None:
+                os.environ.pop("OMP_THREAD_LIMIT", None)
+
 # ===============================
 # TESSERACT PATH CONFIGURATION
 # ===============================
@@ -47,6 +98,51 @@ def setup_tesseract():
 if OCR_ENABLED:
     setup_tesseract()
 
+# ===============================
+# PDF BACKEND (PER DEPLOYMENT)
+# ===============================
+# pdfplumber: full character layout (reference output)
+# pdfminer:   low-level text device, no layout objects (faster)
+PDF_BACKENDS = ("pdfplumber", "pdfminer")
+PDF_BACKEND = "pdfplumber"  # RESUME_PDF_BACKEND is applied at the end of the module
+
+# Same gaps pdfplumber's extract_text uses for spaces / line breaks (points)
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+def set_pdf_backend(backend):
+    """Select the PDF text backend for this process"""
+    global PDF_BACKEND
+
+    if backend not in PDF_BACKENDS:
+        raise ValueError(
+            f"Unknown PDF backend: {backend!r} (use {' or '.join(PDF_BACKENDS)})"
+        )
+
+    PDF_BACKEND = backend
+
+# ===============================
+# IN-MEMORY FILES
+# ===============================
+class NamedBytesIO(io.BytesIO):
+    """
+    BytesIO with a .name, so raw bytes (from a worker process, an archive,
+    a cache miss...) can go through extract_text like an uploaded file
+    """
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def read_file_bytes(file):
+    """Return (name, bytes) for an uploaded or opened resume file"""
+    if hasattr(file, "getvalue"):
+        return file.name, file.getvalue()
+
+    file.seek(0)
+    return file.name, file.read()
+
 # ===============================
 # TEXT + METADATA EXTRACTION
 # ===============================
@@ -54,58 +150,260 @@ def extract_text(file):
     """
     Main entry point - returns tuple (text, metadata)
     metadata includes font sizes for name detection
+    Raises ValueError for anything but .pdf / .docx (any case).
     """
-    if file.name.endswith(".pdf"):
+    extension = os.path.splitext(file.name)[1].lower()
+    if extension == ".pdf":
         return extract_pdf(file)
-    elif file.name.endswith(".docx"):
+    elif extension == ".docx":
         text = extract_docx(file)
         return text, {}
-    return "", {}
+    raise ValueError(f"Unsupported file type: {file.name}")
 
-def extract_pdf(file):
+def extract_pdf(file, backend=None):
     """
     Extract text and font metadata from PDF
     Returns: (text, metadata_dict)
+    backend: one of PDF_BACKENDS (default: PDF_BACKEND)
+    OCR is decided per page: pages with a usable text layer keep their
+    extracted text, text-poor pages with images are OCR'd. If the document
+    is still not meaningful (e.g. outlined / vector text, no image
+    objects), every remaining text-poor page is OCR'd too.
+    """
+    read_pages = PDF_PAGE_READERS[backend or PDF_BACKEND]
+
+    page_texts, ocr_pages, font_text, font_sizes = read_pages(file)
+    ocr_pages = list(ocr_pages)
+
+    if ocr_pages and OCR_ENABLED:
+        print(f"⚠️ Image pages detected in {file.name}: OCR on page(s) {ocr_pages}")
+        ocr_into(file, ocr_pages, page_texts)
+
+    text = join_page_texts(page_texts)
+
+    if not is_text_meaningful(text) and OCR_ENABLED:
+        remaining = [
+            number for number, page_text in enumerate(page_texts, start=1)
+            if number not in ocr_pages and not is_text_meaningful(page_text)
+        ]
+        if remaining:
+            print(f"⚠️ No usable text layer in {file.name}: OCR on page(s) {remaining}")
+            ocr_into(file, remaining, page_texts)
+            ocr_pages += remaining
+            text = join_page_texts(page_texts)
+
+    if is_text_meaningful(text):
+        # Font sizes only describe the header when page 1 kept its text layer
+        metadata = {}
+        if font_sizes and 1 not in ocr_pages:
+            metadata = {'font_text': font_text, 'font_sizes': font_sizes}
+        return text, metadata
+
+    if not OCR_ENABLED:
+        print("⚠️ OCR disabled. Skipping image-based PDF.")
+    return "", {}
+
+def ocr_into(file, page_numbers, page_texts):
+    """OCR pages and put the non-empty results into page_texts (in place)"""
+    for number, ocr_text in ocr_pdf_pages(file, page_numbers).items():
+        if ocr_text:
+            page_texts[number - 1] = ocr_text
+
+def join_page_texts(page_texts):
+    return "".join(page_text + "\n" for page_text in page_texts if page_text)
+
+def read_pdf_pages(file):
     """
-    text = ""
-    font_data = []  # Store (text, font_size) pairs
+    pdfplumber backend.
+    Returns (page_texts, ocr_pages, font_text, font_sizes):
+    ocr_pages are 1-based numbers of text-poor pages with images, font
+    data covers page 1 only (one float per character).
+    """
+    page_texts = []
+    ocr_pages = []
+    font_text = []
+    font_sizes = array('f')
 
     try:
         with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
+            for number, page in enumerate(pdf.pages, start=1):
+                page_text = ""
                 try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                    page_text = page.extract_text() or ""
 
-                    chars = page.chars
-                    if chars:
-                        for char in chars:
+                    if number == 1:
+                        for char in page.chars:
                             if 'text' in char and 'size' in char:
-                                font_data.append({
-                                    'text': char['text'],
-                                    'size': char['size']
-                                })
+                                font_text.append(char['text'])
+                                font_sizes.extend([char['size']] * len(char['text']))
+
+                    # Text-poor page: OCR it (blank pages have nothing to recognize)
+                    if not is_text_meaningful(page_text) and page.images:
+                        ocr_pages.append(number)
 
                 except Exception:
-                    continue
+                    pass
+
+                page_texts.append(page_text)
 
     except Exception as e:
         print(f"Error with pdfplumber: {e}")
 
-    metadata = {'font_data': font_data}
+    return page_texts, ocr_pages, "".join(font_text), font_sizes
 
-    if is_text_meaningful(text):
-        return text, metadata
+class FastTextDevice(PDFTextDevice):
+    """
+    pdfminer device that writes characters straight into a buffer:
+    no LTChar objects and no layout analysis. Spaces and line breaks
+    come from glyph positions (X_TOLERANCE / Y_TOLERANCE), text keeps
+    content-stream order.
+    """
 
-    # OCR fallback (ONLY if enabled)
-    if OCR_ENABLED:
-        print(f"⚠️ Image-based PDF detected: {file.name}. Using OCR...")
-        ocr_text = extract_pdf_with_ocr(file)
-        return ocr_text, {}
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.keep_fonts = False
+        self.start_page()
 
-    print("⚠️ OCR disabled. Skipping image-based PDF.")
-    return "", {}
+    def start_page(self):
+        self.parts = []
+        self.has_images = False
+        self.font_text = []
+        self.font_sizes = array('f')
+        self._last = None  # (x_end, top) of the previous visible character
+        self._space = False  # blank glyph(s) since that character
+
+    def page_text(self):
+        return "".join(self.parts).strip()
+
+    def render_image(self, name, stream):
+        self.has_images = True
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        advance = font.char_width(cid) * fontsize * scaling
+
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            return advance
+
+        (a, b, c, d, x, y) = matrix
+        size = fontsize * abs(d)
+        top = y + size  # lines are matched on glyph tops, so superscripts stay inline
+
+        if self.keep_fonts:
+            self.font_text.append(text)
+            self.font_sizes.extend([size] * len(text))
+
+        # Blank glyphs only separate words (like pdfplumber's extract_text)
+        if text.isspace():
+            self._space = True
+            return advance
+
+        if self._last is not None:
+            last_x, last_top = self._last
+            if abs(top - last_top) > Y_TOLERANCE:
+                self.parts.append("\n")
+            elif self._space or x - last_x > X_TOLERANCE:
+                self.parts.append(" ")
+
+        self.parts.append(text)
+        self._last = (x + advance * a, top)
+        self._space = False
+
+        return advance
+
+def read_pdf_pages_fast(file):
+    """pdfminer backend: same return value as read_pdf_pages"""
+    page_texts = []
+    ocr_pages = []
+    font_text = ""
+    font_sizes = array('f')
+
+    try:
+        file.seek(0)
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = FastTextDevice(rsrcmgr)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+        for number, page in enumerate(PDFPage.get_pages(file), start=1):
+            device.start_page()
+            device.keep_fonts = number == 1
+
+            try:
+                interpreter.process_page(page)
+            except Exception:
+                pass
+
+            page_text = device.page_text()
+            page_texts.append(page_text)
+
+            if number == 1:
+                font_text, font_sizes = "".join(device.font_text), device.font_sizes
+
+            if not is_text_meaningful(page_text) and device.has_images:
+                ocr_pages.append(number)
+
+    except Exception as e:
+        print(f"Error with pdfminer: {e}")
+
+    return page_texts, ocr_pages, font_text, font_sizes
+
+PDF_PAGE_READERS = {
+    "pdfplumber": read_pdf_pages,
+    "pdfminer": read_pdf_pages_fast,
+}
+
+def compare_pdf_backends(sample_dir):
+    """
+    Run every backend over the PDFs under sample_dir (text layer only,
+    no OCR) and report throughput plus how far each one drifts from
+    pdfplumber: share of files with different text, mean Jaccard
+    distance of the token sets.
+    """
+    paths = sorted(glob.glob(os.path.join(sample_dir, "**", "*.pdf"), recursive=True))
+    samples = []
+    for path in paths:
+        with open(path, "rb") as f:
+            samples.append((path, f.read()))
+
+    if not samples:
+        return {}
+
+    outputs = {}
+    seconds = {}
+    for backend in PDF_BACKENDS:
+        read_pages = PDF_PAGE_READERS[backend]
+        start = time.perf_counter()
+        outputs[backend] = [
+            "\n".join(read_pages(NamedBytesIO(data, path))[0]) for path, data in samples
+        ]
+        seconds[backend] = time.perf_counter() - start
+
+    report = {"files": len(samples)}
+    for backend in PDF_BACKENDS:
+        report[f"{backend}_files_per_sec"] = (
+            len(samples) / seconds[backend] if seconds[backend] else 0.0
+        )
+
+    for backend in PDF_BACKENDS[1:]:
+        distances = []
+        differing = 0
+        for text, reference in zip(outputs[backend], outputs["pdfplumber"]):
+            tokens, reference_tokens = set(text.split()), set(reference.split())
+            union = tokens | reference_tokens
+            distances.append(1 - len(tokens & reference_tokens) / len(union) if union else 0.0)
+            differing += text != reference
+
+        report[f"{backend}_diff_rate"] = differing / len(samples)
+        report[f"{backend}_mean_token_divergence"] = sum(distances) / len(distances)
+
+    print("=" * 50)
+    print("PDF BACKEND COMPARISON")
+    for key, value in report.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    print("=" * 50)
+
+    return report
 
 def is_text_meaningful(text):
     """Check if extracted text is meaningful"""
@@ -115,50 +413,147 @@ def is_text_meaningful(text):
     return alpha_chars > 20
 
 def extract_pdf_with_ocr(file):
-    """OCR-based extraction for image PDFs"""
+    """OCR-based extraction for image PDFs (every page)"""
     if not OCR_ENABLED:
         return ""
 
-    text = ""
+    page_texts = ocr_pdf_pages(file)
+    return "".join(text + "\n" for text in page_texts.values() if text).strip()
+
+def ocr_pdf_pages(file, page_numbers=None):
+    """
+    OCR selected pages (1-based; None = all pages) of a PDF.
+    At most OCR_MAX_PAGES pages. The PDF is spooled to one temp file; each
+    DPI step of OCR_DPI_STEPS renders all pending pages in one poppler
+    call per contiguous run, and only pages whose result is not confident
+    and meaningful are retried at the next DPI (the best attempt is kept).
+    Tesseract runs OCR_WORKERS pages at a time (a subprocess, so threads
+    are enough).
+    Returns {page_number: cleaned OCR text}
+    """
+    if not OCR_ENABLED:
+        return {}
 
     try:
-        temp_path = f"temp_{file.name}"
+        data = read_file_bytes(file)[1]
+    except Exception as e:
+        print(f"OCR failed: {e}")
+        return {}
 
-        with open(temp_path, "wb") as f:
-            f.write(file.getbuffer())
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
 
         try:
-            images = convert_from_path(temp_path, dpi=300)
+            if page_numbers is None:
+                page_numbers = range(1, pdfinfo_from_path(path)["Pages"] + 1)
         except Exception as e:
-            print(f"Error converting PDF: {e}")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            return ""
+            print(f"OCR failed: {e}")
+            return {}
 
-        for i, image in enumerate(images):
-            try:
-                page_text = pytesseract.image_to_string(
-                    image,
-                    lang='eng',
-                    config='--psm 6'
-                )
+        page_numbers = list(page_numbers)
+        if len(page_numbers) > OCR_MAX_PAGES:
+            print(f"⚠️ OCR limited to {OCR_MAX_PAGES} of {len(page_numbers)} pages: {file.name}")
+            page_numbers = page_numbers[:OCR_MAX_PAGES]
 
-                if page_text:
-                    text += page_text + "\n"
+        if not page_numbers:
+            return {}
 
-            except Exception as e:
-                print(f"Error OCR page {i+1}: {e}")
-                continue
+        return ocr_pdf_path(path, page_numbers)
 
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+def ocr_pdf_path(path, page_numbers):
+    """ocr_pdf_pages on a PDF already on disk"""
+    best = {number: ("", -1.0) for number in page_numbers}
+    pending = list(page_numbers)
 
-        text = clean_ocr_text(text)
-        return text
+    workers = max(1, min(OCR_WORKERS, len(page_numbers)))
+    limit = single_threaded_tesseract() if workers > 1 else nullcontext()
 
+    with ThreadPoolExecutor(max_workers=workers) as executor, limit:
+        for dpi in OCR_DPI_STEPS:
+            if not pending:
+                break
+
+            images = render_pdf_pages(path, pending, dpi)
+            results = dict(zip(
+                images, executor.map(lambda item: ocr_page_image(*item, dpi), images.items())
+            ))
+
+            retry = []
+            for number in pending:
+                page_text, confidence = results.get(number, ("", -1.0))
+
+                if confidence > best[number][1]:
+                    best[number] = (page_text, confidence)
+
+                if not (confidence >= OCR_MIN_CONFIDENCE and is_text_meaningful(page_text)):
+                    retry.append(number)
+
+            pending = retry
+
+    return {
+        number: clean_ocr_text(text) if text else ""
+        for number, (text, _) in best.items()
+    }
+
+def render_pdf_pages(path, page_numbers, dpi):
+    """{page_number: PIL image}, one pdftoppm call per run of consecutive pages"""
+    runs = []
+    for number in sorted(page_numbers):
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+
+    images = {}
+    for first, last in runs:
+        try:
+            rendered = convert_from_path(
+                path, dpi=dpi, first_page=first, last_page=last,
+                thread_count=max(1, min(OCR_WORKERS, last - first + 1))
+            )
+        except Exception as e:
+            print(f"Error rendering pages {first}-{last} at {dpi} dpi: {e}")
+            continue
+
+        images.update(zip(range(first, last + 1), rendered))
+
+    return images
+
+def ocr_page_image(number, image, dpi):
+    """ocr_image for one rendered page; failures score as no text"""
+    try:
+        return ocr_image(image)
     except Exception as e:
-        print(f"OCR failed: {e}")
-        return ""
+        print(f"Error OCR page {number} at {dpi} dpi: {e}")
+        return "", -1.0
+
+def ocr_image(image):
+    """Tesseract on one image -> (text with line breaks, mean word confidence)"""
+    result = pytesseract.image_to_data(
+        image,
+        lang='eng',
+        config='--psm 6',
+        output_type=pytesseract.Output.DICT
+    )
+
+    lines = {}
+    confidences = []
+
+    for i, word in enumerate(result["text"]):
+        confidence = float(result["conf"][i])
+        if confidence < 0 or not word.strip():
+            continue
+
+        confidences.append(confidence)
+        line = (result["block_num"][i], result["par_num"][i], result["line_num"][i])
+        lines.setdefault(line, []).append(word)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+
+    return text, confidence
 
 def clean_ocr_text(text):
     """Clean OCR artifacts"""
@@ -185,16 +580,112 @@ def clean_ocr_text(text):
 
     return text.strip()
 
+# ===============================
+# DOCX (STREAMING XML)
+# ===============================
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P = W_NS + "p"
+W_R = W_NS + "r"
+W_T = W_NS + "t"
+W_BR = W_NS + "br"
+W_TYPE = W_NS + "type"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Run children with a text equivalent (as python-docx renders them)
+DOCX_RUN_TEXT = {
+    W_NS + "tab": "\t",
+    W_NS + "ptab": "\t",
+    W_NS + "cr": "\n",
+    W_NS + "noBreakHyphen": "-",
+}
+
 def extract_docx(file):
-    """Extract text from DOCX"""
+    """Extract text from DOCX (body paragraphs and table cells)"""
     try:
-        doc = Document(file)
-        text = "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-        return text
+        return "\n".join(p for p in iter_docx_paragraphs(file) if p.strip())
     except Exception as e:
         print(f"Error extracting DOCX: {e}")
         return ""
 
+def iter_docx_paragraphs(file):
+    """
+    Yield paragraph texts from word/document.xml in document order,
+    parsed incrementally straight out of the zip (no object model).
+    Covers table cells and text boxes; paragraphs are freed once read.
+    """
+    file.seek(0)
+
+    with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as xml:
+        paragraphs = []  # text parts of each open (possibly nested) paragraph
+        in_run = 0
+        in_fallback = 0  # mc:Fallback repeats its mc:Choice content
+
+        for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+
+            if tag == MC_FALLBACK:
+                in_fallback += 1 if event == "start" else -1
+                continue
+            if in_fallback:
+                continue
+
+            if event == "start":
+                if tag == W_P:
+                    paragraphs.append([])
+                elif tag == W_R:
+                    in_run += 1
+                continue
+
+            if tag == W_P:
+                yield "".join(paragraphs.pop())
+                elem.clear()
+            elif tag == W_R:
+                in_run -= 1
+            elif in_run and paragraphs:
+                if tag == W_T:
+                    paragraphs[-1].append(elem.text or "")
+                elif tag == W_BR:
+                    # Line breaks only; page / column breaks have no text
+                    if elem.get(W_TYPE, "textWrapping") == "textWrapping":
+                        paragraphs[-1].append("\n")
+                elif tag in DOCX_RUN_TEXT:
+                    paragraphs[-1].append(DOCX_RUN_TEXT[tag])
+
+def compare_docx_extraction(file):
+    """
+    Compatibility check of the streaming reader against python-docx:
+    every non-blank python-docx paragraph must appear, in order, in the
+    streamed paragraphs (which may add table / text-box content).
+    """
+    reference = [p.text for p in Document(file).paragraphs if p.text.strip()]
+    streamed = [p for p in iter_docx_paragraphs(file) if p.strip()]
+
+    missing = []
+    position = 0
+    for text in reference:
+        match = next(
+            (i for i in range(position, len(streamed)) if text in streamed[i]), None
+        )
+        if match is None:
+            missing.append(text)
+        else:
+            position = match + 1
+
+    report = {
+        "python_docx_paragraphs": len(reference),
+        "streamed_paragraphs": len(streamed),
+        "missing": missing,
+        "compatible": not missing,
+    }
+
+    print("=" * 50)
+    print(f"DOCX EXTRACTION CHECK: {getattr(file, 'name', '?')}")
+    for key, value in report.items():
+        print(f"{key}: {len(value) if key == 'missing' else value}")
+    print("=" * 50)
+
+    return report
+
 def test_ocr_availability():
     """Test OCR configuration"""
     if not OCR_ENABLED:
@@ -209,3 +700,10 @@ def test_ocr_availability():
 if OCR_ENABLED:
     if not test_ocr_availability():
         print("⚠️ WARNING: OCR not configured. Image PDFs may not work.")
+
+# Environment default, validated like an explicit choice
+set_pdf_backend(os.getenv("RESUME_PDF_BACKEND", PDF_BACKEND))
+
+if __name__ == "__main__":
+    # python -m utils.pdf_parser <sample_dir>
+    compare_pdf_backends(sys.argv[1] if len(sys.argv) > 1 else ".")
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# ===============================
+# PERSISTENT RESUME CACHE
+# ===============================
+# Parsed + cleaned resumes keyed by the SHA-256 of the uploaded bytes,
+# so a known resume is never re-parsed (pdfplumber/OCR) or re-cleaned (spaCy)
+DEFAULT_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", ".resume_cache/resumes.db")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB of compressed entries
+
+
+def content_hash(data):
+    """SHA-256 hex digest of raw file bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    """
+    On-disk store of resume artifacts (SQLite, one row per file hash and
+    version stamp).
+    - version: only entries written under this version are returned; other
+      versions (e.g. another process with a different PDF or cleaner
+      backend sharing the file) are kept and age out by LRU
+    - max_bytes: least recently used entries are evicted above this size
+    Safe to share between threads (e.g. Streamlit sessions).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, version="", max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Caches from before the (key, version) layout are simply dropped
+        self._conn.execute("DROP TABLE IF EXISTS entries")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (key, version)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_artifacts_last_used ON artifacts(last_used)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._current_size()
+
+    def _current_size(self):
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        return row[0]
+
+    def get(self, key):
+        """Return the cached artifact dict for a file hash (this version), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM artifacts WHERE key = ? AND version = ?",
+                (key, self.version)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE artifacts SET last_used = ? WHERE key = ? AND version = ?",
+                (time.time(), key, self.version)
+            )
+            self._conn.commit()
+
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError):
+            return None
+
+    def put(self, key, artifact):
+        """Store an artifact dict under a file hash (this version)"""
+        payload = zlib.compress(json.dumps(artifact).encode("utf-8"))
+        size = len(payload)
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM artifacts WHERE key = ? AND version = ?",
+                (key, self.version)
+            ).fetchone()
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, version, payload, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, self.version, payload, size, time.time())
+            )
+            self._conn.commit()
+
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of max_bytes (lock held)"""
+        # Other processes may share the file: resync before deciding
+        self._total_bytes = self._current_size()
+        target = int(self.max_bytes * 0.9)
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, version, size in self._conn.execute(
+            "SELECT key, version, size FROM artifacts ORDER BY last_used ASC"
+        ):
+            if self._total_bytes <= target:
+                break
+            doomed.append((key, version))
+            self._total_bytes -= size
+
+        self._conn.executemany("DELETE FROM artifacts WHERE key = ? AND version = ?", doomed)
+        self._conn.commit()
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ===============================
+# IN-MEMORY RESULT CACHE
+# ===============================
+class ResultCache:
+    """
+    Thread-safe in-memory LRU cache with an entry limit and a TTL (seconds).
+    Used to memoize finished analyses (and their exports) across reruns
+    and user sessions. Values are shared: treat them as read-only.
+    """
+
+    def __init__(self, max_entries=32, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            stored_at, value = item
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries"""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -1,15 +1,73 @@
-import spacy
+import os
 import re
+import time
 from functools import lru_cache
 
+from utils.nlp import get_nlp, pipes_except, CLEAN_COMPONENTS
+from utils.lexicon import STOP_WORDS, lemmatize
+
 # ===============================
-# LOAD SPACY MODEL (OPTIMIZED)
+# SPACY MODEL
 # ===============================
-try:
-    nlp = spacy.load("en_core_web_sm", disable=["ner", "parser"])  # Faster: only tokenizer + POS
-except:
-    print("⚠️ spaCy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+# Shared with the matcher and loaded lazily by utils.nlp; cleaning only
+# runs tokenizer + POS tagger + lemmatizer (no NER)
+
+# Bump whenever cleaning output changes (invalidates cached cleaned text)
+CLEANER_VERSION = "2"
+
+# ===============================
+# CLEANING BACKEND
+# ===============================
+# "spacy": POS-based lemmatization (default)
+# "fast":  regex tokens + static stop words + lookup-table lemmas, no spaCy
+#          (first-pass triage of very large pools; no NER name fallback)
+CLEANER_BACKENDS = ("spacy", "fast")
+CLEANER_BACKEND = "spacy"  # RESUME_CLEANER_BACKEND is applied at the end of the module
+
+
+def set_cleaner_backend(backend):
+    """Select the cleaning backend for this process"""
+    global CLEANER_BACKEND
+
+    if backend not in CLEANER_BACKENDS:
+        raise ValueError(
+            f"Unknown cleaner backend: {backend!r} (use {' or '.join(CLEANER_BACKENDS)})"
+        )
+
+    CLEANER_BACKEND = backend
+    clean_text.cache_clear()
+
+
+def cleaner_version():
+    """Version stamp of the cleaning output (includes the backend)"""
+    return f"{CLEANER_VERSION}-{CLEANER_BACKEND}"
+
+# Used when spaCy is not available
+FALLBACK_STOP_WORDS = {
+    'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are',
+    'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'should', 'could', 'may', 'might', 'must',
+    'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she',
+    'it', 'we', 'they', 'what', 'who', 'when', 'where', 'why', 'how',
+    'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other',
+    'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so',
+    'than', 'too', 'very', 'can', 'just', 'should', 'now'
+}
+
+# NER for the name fallback only looks at the top of the resume
+ENTITY_CHARS = 3000
+
+# Precompiled normalization patterns
+_SPACES_RE = re.compile(r'[^\S\n]+')
+_BLANK_LINES_RE = re.compile(r' ?\n\s*')
+_URL_RE = re.compile(r'http\S+|www\.\S+', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+')
+_PHONE_RE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+_SPECIAL_RE = re.compile(r'[^\w\s-]')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+
+# Fast backend tokenizer: whitespace and hyphens, like spaCy's infix split
+_FAST_SPLIT_RE = re.compile(r'[\s\-]+')
 
 # ===============================
 # MAIN CLEANING FUNCTION (ENHANCED)
@@ -26,59 +84,150 @@ def clean_text(text):
     """
     if not text or not isinstance(text, str):
         return ""
-    
-    # Pre-processing: normalize whitespace and lowercase
-    text = text.lower().strip()
-    text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
+
+    cleaned, _ = analyze_texts([text])[0]
+    return cleaned
+
+
+def normalize_text(text):
+    """
+    Regex stage of cleaning. Case and line breaks are kept so the tagger
+    (and NER, when needed) see natural text; output is lower-cased later.
+    """
+    # Pre-processing: normalize whitespace
+    text = text.strip()
+    text = _SPACES_RE.sub(' ', text)  # Multiple spaces to single space
+    text = _BLANK_LINES_RE.sub('\n', text)  # Blank lines to single line break
     
     # Remove URLs
-    text = re.sub(r'http\S+|www\.\S+', '', text)
+    text = _URL_RE.sub('', text)
     
     # Remove email addresses (keep emails separate for extraction)
-    text = re.sub(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', '', text)
+    text = _EMAIL_RE.sub('', text)
     
     # Remove phone numbers (keep separate for extraction)
-    text = re.sub(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', '', text)
+    text = _PHONE_RE.sub('', text)
     
     # Remove special characters but keep hyphens in compound words
-    text = re.sub(r'[^\w\s-]', ' ', text)
+    text = _SPECIAL_RE.sub(' ', text)
     
     # Remove standalone numbers (but keep alphanumeric like "c++", "html5")
-    text = re.sub(r'\b\d+\b', '', text)
-    
-    # Use spaCy for advanced cleaning
-    if nlp:
-        doc = nlp(text)
-        tokens = []
-        
-        for token in doc:
-            # Keep only:
-            # - Alphabetic tokens (excluding pure numbers)
-            # - Not stop words
-            # - Length > 2 (avoid noise like "is", "a")
-            if token.is_alpha and not token.is_stop and len(token.text) > 2:
-                # Use lemma for better matching (e.g., "programming" -> "program")
-                tokens.append(token.lemma_)
-        
-        return " ".join(tokens)
-    
-    # Fallback if spaCy not available: basic cleaning
-    else:
-        # Remove common stop words manually
-        stop_words = {
-            'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are',
-            'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does',
-            'did', 'will', 'would', 'should', 'could', 'may', 'might', 'must',
-            'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she',
-            'it', 'we', 'they', 'what', 'who', 'when', 'where', 'why', 'how',
-            'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other',
-            'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so',
-            'than', 'too', 'very', 'can', 'just', 'should', 'now'
-        }
-        
-        words = text.split()
-        filtered_words = [w for w in words if w not in stop_words and len(w) > 2]
-        return " ".join(filtered_words)
+    text = _NUMBER_RE.sub('', text)
+
+    return text
+
+
+def _lemmas_from_doc(doc):
+    """Cleaned, lower-cased lemma string for a tagged spaCy Doc"""
+    tokens = []
+
+    for token in doc:
+        # Keep only:
+        # - Alphabetic tokens (excluding pure numbers)
+        # - Not stop words
+        # - Length > 2 (avoid noise like "is", "a")
+        if token.is_alpha and not token.is_stop and len(token.text) > 2:
+            # Use lemma for better matching (e.g., "programming" -> "program")
+            tokens.append(token.lemma_.lower())
+
+    return " ".join(tokens)
+
+
+def _fallback_clean(normalized):
+    """Basic cleaning if spaCy is not available"""
+    words = normalized.lower().split()
+    filtered_words = [w for w in words if w not in FALLBACK_STOP_WORDS and len(w) > 2]
+    return " ".join(filtered_words)
+
+
+def _fast_clean(normalized):
+    """Fast backend: same token rules as the spaCy path, without a Doc"""
+    tokens = []
+
+    for word in _FAST_SPLIT_RE.split(normalized.lower()):
+        if word.isalpha() and len(word) > 2 and word not in STOP_WORDS:
+            tokens.append(lemmatize(word))
+
+    return " ".join(tokens)
+
+
+def _doc_head(doc, max_chars):
+    """Copy of the tokens starting before max_chars (no re-tokenization)"""
+    end = next((token.i for token in doc if token.idx >= max_chars), len(doc))
+    return doc[:end].as_doc()
+
+
+# ===============================
+# COMBINED ANALYSIS (ONE SPACY PASS)
+# ===============================
+def analyze_texts(texts, want_entities=None, batch_size=50, n_process=1):
+    """
+    Clean texts and (optionally) find PERSON entities in ONE spaCy pass:
+    each text is tokenized and tagged once, and NER runs only for texts
+    flagged in want_entities, on the top ENTITY_CHARS of the same Doc.
+    Returns a list of (cleaned_text, person_entities) tuples.
+    """
+    texts = list(texts)
+    if want_entities is None:
+        want_entities = [False] * len(texts)
+
+    items = zip(texts, want_entities, range(len(texts)))
+
+    return [
+        (cleaned, entities)
+        for cleaned, entities, _ in iter_analyze_texts(items, batch_size, n_process)
+    ]
+
+
+def iter_analyze_texts(items, batch_size=50, n_process=1, backend=None):
+    """
+    Streaming core of analyze_texts / clean_text / clean_texts_batch.
+    items: iterable of (text, want_entities, context); context is passed
+    through untouched (nlp.pipe as_tuples), so callers can attach anything.
+    Yields (cleaned_text, person_entities, context) in input order.
+    backend: "spacy" or "fast" (default: CLEANER_BACKEND)
+    """
+    backend = backend or CLEANER_BACKEND
+
+    if backend == "fast":
+        for text, _, context in items:
+            normalized = normalize_text(text) if isinstance(text, str) and text else ""
+            yield _fast_clean(normalized), [], context
+        return
+
+    nlp = get_nlp()
+
+    if not nlp:
+        for text, _, context in items:
+            normalized = normalize_text(text) if isinstance(text, str) and text else ""
+            yield _fallback_clean(normalized), [], context
+        return
+
+    ner = nlp.get_pipe("ner") if "ner" in nlp.pipe_names else None
+
+    stream = (
+        (normalize_text(text) if isinstance(text, str) and text else "", (want, context))
+        for text, want, context in items
+    )
+
+    docs = nlp.pipe(
+        stream,
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process,
+        disable=pipes_except(nlp, CLEAN_COMPONENTS)
+    )
+
+    for doc, (want, context) in docs:
+        entities = []
+
+        if want and ner is not None:
+            head = ner(_doc_head(doc, ENTITY_CHARS))
+            entities = [
+                ent.text.strip() for ent in head.ents if ent.label_ == "PERSON"
+            ]
+
+        yield _lemmas_from_doc(doc), entities, context
 
 # ===============================
 # ADDITIONAL UTILITY FUNCTIONS
@@ -106,7 +255,7 @@ def extract_key_phrases(text, top_n=20):
     Extract most important phrases using simple frequency analysis
     Useful for quick skill/keyword identification
     """
-    if not nlp or not text:
+    if not get_nlp() or not text:
         return []
     
     # Clean text
@@ -168,25 +317,19 @@ def remove_noise_words(text):
 # ===============================
 # BATCH PROCESSING (PERFORMANCE)
 # ===============================
-def clean_texts_batch(texts):
+def clean_texts_batch(texts, batch_size=50, n_process=1):
     """
     Clean multiple texts efficiently using spaCy's pipe
-    Much faster for processing many resumes
+    Much faster for processing many resumes; output is identical to
+    calling clean_text on each text.
+    n_process > 1 lets spaCy fan out to worker processes.
     """
-    if not nlp or not texts:
-        return [clean_text(t) for t in texts]
-    
-    cleaned = []
-    
-    # Use spaCy's pipe for batch processing (much faster)
-    for doc in nlp.pipe(texts, batch_size=50):
-        tokens = []
-        for token in doc:
-            if token.is_alpha and not token.is_stop and len(token.text) > 2:
-                tokens.append(token.lemma_)
-        cleaned.append(" ".join(tokens))
-    
-    return cleaned
+    items = ((text, False, None) for text in texts)
+
+    return [
+        cleaned
+        for cleaned, _, _ in iter_analyze_texts(items, batch_size, n_process)
+    ]
 
 # ===============================
 # QUALITY CHECKS
@@ -226,4 +369,60 @@ def compare_cleaning(text):
     print(f"Original length: {len(text)}")
     print(f"Cleaned length: {len(cleaned)}")
     print(f"Retention ratio: {len(cleaned)/len(text)*100:.1f}%")
-    return cleaned
\ No newline at end of file
+    return cleaned
+
+
+def compare_cleaning_backends(texts):
+    """
+    Measure how far the fast backend drifts from the spaCy backend on a
+    sample: mean Jaccard distance of the token sets, share of texts with
+    identical output, and throughput of each backend.
+    Needs the spaCy model: without it the "spacy" side would silently be
+    the regex fallback, so a RuntimeError is raised instead.
+    """
+    texts = [t for t in texts if isinstance(t, str) and t]
+    if not texts:
+        return {}
+
+    if not get_nlp():
+        raise RuntimeError(
+            "spaCy model not available: the spacy backend would run the fallback "
+            "cleaner, so there is no reference to compare against"
+        )
+
+    outputs = {}
+    seconds = {}
+    for backend in CLEANER_BACKENDS:
+        start = time.perf_counter()
+        items = ((text, False, None) for text in texts)
+        outputs[backend] = [c for c, _, _ in iter_analyze_texts(items, backend=backend)]
+        seconds[backend] = time.perf_counter() - start
+
+    distances = []
+    identical = 0
+    for fast, reference in zip(outputs["fast"], outputs["spacy"]):
+        fast_tokens, reference_tokens = set(fast.split()), set(reference.split())
+        union = fast_tokens | reference_tokens
+        distances.append(1 - len(fast_tokens & reference_tokens) / len(union) if union else 0.0)
+        identical += fast == reference
+
+    report = {
+        "texts": len(texts),
+        "mean_token_divergence": sum(distances) / len(distances),
+        "max_token_divergence": max(distances),
+        "identical_ratio": identical / len(texts),
+        "spacy_texts_per_sec": len(texts) / seconds["spacy"] if seconds["spacy"] else 0.0,
+        "fast_texts_per_sec": len(texts) / seconds["fast"] if seconds["fast"] else 0.0,
+    }
+
+    print("=" * 50)
+    print("CLEANING BACKEND COMPARISON")
+    for key, value in report.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    print("=" * 50)
+
+    return report
+
+
+# Environment default, validated like an explicit choice
+set_cleaner_backend(os.getenv("RESUME_CLEANER_BACKEND", CLEANER_BACKEND))
@@ -0,0 +1,176 @@
+import json
+import os
+from bisect import bisect_left
+from collections import Counter
+from heapq import nlargest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from utils.text_cleaner import cleaner_version
+
+# ===============================
+# MEMORY-MAPPED TF-IDF INDEX
+# ===============================
+# A TF-IDF model of the stored resumes (clean_text), fitted once and saved
+# as plain .npy files in one directory:
+#   terms.npy / term_offsets.npy   sorted vocabulary (UTF-8 blob + offsets)
+#   idf.npy                        float32 IDF per term
+#   data.npy / indices.npy / indptr.npy
+#                                  float32 CSR, terms x candidates (rows are
+#                                  the posting lists; documents L2-normalized)
+#   ids.npy                        candidate id of every column
+#   meta.json                      version, shape, store generation
+# Everything is opened with mmap_mode="r": loading is near-instant and
+# worker processes share the same page-cache pages. A JD query is one
+# sparse product over the JD's own terms; nothing is refitted.
+INDEX_VERSION = "1"
+INDEX_FILES = ("terms", "term_offsets", "idf", "data", "indices", "indptr", "ids")
+
+
+class _Vocabulary:
+    """Read-only sorted term sequence over the mapped UTF-8 blob (for bisect)"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def lookup(self, term):
+        """Column of a term, or None"""
+        key = term.encode("utf-8")
+        i = bisect_left(self, key)
+        return i if i < len(self) and self[i] == key else None
+
+
+def _save(directory, name, array):
+    path = os.path.join(directory, f"{name}.npy")
+    tmp = os.path.join(directory, f"{name}.tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def build_tfidf_index(directory, texts, candidate_ids, meta=None):
+    """
+    Fit TF-IDF (the same analyzer and weighting as the batch scorer) over
+    cleaned resume texts and write the index to `directory`.
+    meta: extra entries for meta.json (e.g. the store generation it reflects)
+    Returns the opened TfidfIndex.
+    """
+    os.makedirs(directory, exist_ok=True)
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), dtype=np.float32)
+    try:
+        matrix = vectorizer.fit_transform(texts)
+        terms = vectorizer.get_feature_names_out()
+        idf = vectorizer.idf_.astype(np.float32)
+    except ValueError:
+        # No usable terms at all (empty corpus / empty texts)
+        matrix = csr_matrix((len(candidate_ids), 0), dtype=np.float32)
+        terms, idf = [], np.zeros(0, dtype=np.float32)
+
+    # Vocabulary is already sorted; UTF-8 byte order keeps that order
+    encoded = [term.encode("utf-8") for term in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(term) for term in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    postings = matrix.T.tocsr()
+    postings.sort_indices()
+
+    _save(directory, "terms", blob)
+    _save(directory, "term_offsets", offsets)
+    _save(directory, "idf", idf)
+    _save(directory, "data", postings.data.astype(np.float32))
+    # One index dtype for both arrays, or scipy would copy them on load
+    index_dtype = np.int32 if postings.nnz < np.iinfo(np.int32).max else np.int64
+    _save(directory, "indices", postings.indices.astype(index_dtype))
+    _save(directory, "indptr", postings.indptr.astype(index_dtype))
+    _save(directory, "ids", candidate_ids)
+
+    meta = {
+        **(meta or {}),
+        "version": INDEX_VERSION,
+        "cleaner": cleaner_version(),
+        "candidates": int(len(candidate_ids)),
+        "terms": int(len(encoded)),
+    }
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    return TfidfIndex(directory)
+
+
+class TfidfIndex:
+    """
+    Memory-mapped TF-IDF index written by build_tfidf_index.
+    - similarities: cosine (0-1) of every indexed candidate to a cleaned JD
+    - search:       best (candidate id, cosine) pairs for a cleaned JD
+    The IDF is the stored corpus's, so scores differ slightly from the
+    per-batch refit of compute_semantic_similarities (which also counts
+    the JD as a document). CandidateStore.index_is_stale tells when to rebuild.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"TF-IDF index in {directory} has an unsupported version; rebuild it")
+        if self.meta.get("cleaner") != cleaner_version():
+            print("⚠️ TF-IDF index was built with another text cleaner; JD terms may not match")
+
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in INDEX_FILES
+        }
+
+        self.vocabulary = _Vocabulary(arrays["terms"], arrays["term_offsets"])
+        self.idf = arrays["idf"]
+        self.ids = arrays["ids"]
+        self.postings = csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=(len(self.vocabulary), len(self.ids)),
+            copy=False
+        )
+        self.analyzer = TfidfVectorizer(ngram_range=(1, 2)).build_analyzer()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def similarities(self, job_desc_clean):
+        """float32 cosine (0-1) per indexed candidate, in self.ids order"""
+        jd_counts = Counter(self.analyzer(job_desc_clean))
+
+        rows, tf = [], []
+        for term, count in jd_counts.items():
+            row = self.vocabulary.lookup(term)
+            if row is not None:
+                rows.append(row)
+                tf.append(count)
+
+        if not rows:
+            return np.zeros(len(self.ids), dtype=np.float32)
+
+        # Terms outside the vocabulary are dropped, as TfidfVectorizer.transform does
+        weights = np.array(tf, dtype=np.float32) * self.idf[rows]
+        weights /= np.linalg.norm(weights)
+
+        similarities = np.asarray(self.postings[rows].T @ weights).ravel()
+        return np.clip(similarities, 0.0, 1.0)
+
+    def search(self, job_desc_clean, limit=10):
+        """Top `limit` [(candidate id, cosine)] by similarity, ties by index order"""
+        similarities = self.similarities(job_desc_clean)
+        candidates = np.flatnonzero(similarities > 0)
+        best = nlargest(limit, candidates.tolist(), key=lambda i: (similarities[i], -i))
+        return [(int(self.ids[i]), float(similarities[i])) for i in best]